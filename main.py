@@ -1,4 +1,5 @@
 from asyncio import run
+from multiprocessing import freeze_support
 import argparse
 from sys import argv
 from source import KS, KSDownloader
@@ -75,6 +76,7 @@ async def api_server(
 
 
 if __name__ == "__main__":
+    freeze_support()
     run(
         main(),
     )
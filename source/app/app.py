@@ -1,8 +1,11 @@
+from asyncio import Lock
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
 from uvicorn import Config as APIConfig
 from uvicorn import Server
 from source.config import Config, Parameter
 from source.downloader import Downloader
-from source.extract import APIExtractor, HTMLExtractor
+from source.extract import APIExtractor, ExtractorPool, HTMLExtractor
 from source.link import DetailPage, Examiner
 from source.manager import Manager
 from source.module import Database, choose
@@ -27,9 +30,11 @@ from source.tools import (
     Cleaner,
     ColorConsole,
     Mapping,
+    Pipeline,
+    TTLCache,
     Version,
 )
-from source.translation import _, switch_language
+from source.translation import _, get_language, switch_language
 from fastapi import FastAPI
 from fastapi.responses import RedirectResponse
 from source.model import (
@@ -73,14 +78,19 @@ class KS:
         self.config = None
         self.option = None
         self.record = RecordManager()
+        self.recorders = {}
+        self.recorders_lock = Lock()
         self.manager = Manager(**self.params.run())
         self.database = Database(self.manager)
         self.mapping = Mapping(self.manager, self.database)
         self.version = Version(self.manager)
-        self.examiner = Examiner(self.manager)
+        self.examiner = Examiner(self.manager, self.database)
         self.detail_html = DetailPage(self.manager)
         self.extractor_api = APIExtractor(self.manager)
         self.extractor_html = HTMLExtractor(self.manager)
+        self.extractor_pool: ExtractorPool | None = None
+        self.server_mode = server_mode
+        self.detail_cache = TTLCache(**self.manager.detail_cache)
         self.download = Downloader(
             self.manager,
             self.database,
@@ -250,11 +260,10 @@ class KS:
             message = _("提取作品链接失败")
             self.console.warning(message)
             return message
-        for url in urls:
-            await self.detail_one(
-                url,
-                download,
-            )
+        await self.__process_urls(
+            urls,
+            download,
+        )
 
     async def process_links(
         self,
@@ -278,8 +287,8 @@ class KS:
         success = 0
         fail = 0
         data = []
-        for url in urls:
-            if isinstance(result := await self.detail_one(url, download), dict):
+        for result in await self.__process_urls(urls, download):
+            if isinstance(result, dict):
                 success += 1
                 data.append(result)
             else:
@@ -304,6 +313,22 @@ class KS:
             "data": data,
         }
 
+    async def __process_urls(
+        self,
+        urls: list[str],
+        download: bool = True,
+    ) -> list[dict | str]:
+        pipeline = self.manager.pipeline
+        return await Pipeline(
+            (self.__fetch_detail, pipeline["fetch"]),
+            (self.__extract_detail, pipeline["extract"]),
+            (
+                partial(self.__finish_detail, download=download),
+                pipeline["download"],
+            ),
+            queue_size=pipeline["queue"],
+        ).run(urls)
+
     async def detail_one(
         self,
         url: str,
@@ -311,6 +336,33 @@ class KS:
         proxy: str = "",
         cookie: str = "",
     ) -> dict | str:
+        if self.server_mode and (detail_id := self.examiner.extract_params(url)[2]):
+            data = await self.detail_cache.get(
+                detail_id,
+                partial(self.__load_detail, url, proxy, cookie),
+            )
+        else:
+            data = await self.__load_detail(url, proxy, cookie)
+        if isinstance(data, str):
+            return data
+        return await self.__finish_detail(data, download)
+
+    async def __load_detail(
+        self,
+        url: str,
+        proxy: str = "",
+        cookie: str = "",
+    ) -> dict | str:
+        if isinstance(page := await self.__fetch_detail(url, proxy, cookie), str):
+            return page
+        return await self.__extract_detail(page)
+
+    async def __fetch_detail(
+        self,
+        url: str,
+        proxy: str = "",
+        cookie: str = "",
+    ) -> tuple[str, str, bool] | str:
         web, user_id, detail_id = self.examiner.extract_params(
             url,
         )
@@ -318,15 +370,63 @@ class KS:
             message = _("URL 解析失败：{url}").format(url=url)
             self.console.warning(message)
             return message
-        data = await self.__handle_detail_html(
-            detail_id,
-            url,
-            web,
-            proxy,
-            cookie,
-        )
-        if not data:
-            return _("获取作品数据失败")
+        if html := await self.detail_html.run(url, proxy, cookie):
+            return html, detail_id, web
+        return _("获取作品数据失败")
+
+    async def __extract_detail(
+        self,
+        page: tuple[str, str, bool],
+    ) -> dict | str:
+        html, detail_id, web = page
+        if pool := self.__get_extractor_pool():
+            try:
+                data = await pool.run(
+                    html,
+                    detail_id,
+                    web,
+                )
+            except BrokenProcessPool:
+                self.console.warning(_("解析进程异常退出，改为在主进程内解析"))
+                self.__close_extractor_pool(wait=False)
+                self.manager.parse_workers = 0
+                data = self.extractor_html.run(
+                    html,
+                    detail_id,
+                    web,
+                )
+        else:
+            data = self.extractor_html.run(
+                html,
+                detail_id,
+                web,
+            )
+        return data or _("获取作品数据失败")
+
+    def __get_extractor_pool(self) -> ExtractorPool | None:
+        if not (self.server_mode and self.manager.parse_workers):
+            return None
+        if not self.extractor_pool:
+            self.extractor_pool = ExtractorPool(
+                self.manager.parse_workers,
+                get_language(),
+            )
+        return self.extractor_pool
+
+    def __close_extractor_pool(self, wait: bool = True) -> None:
+        if self.extractor_pool:
+            # 不等待时保留已提交的任务，由旧进程池处理完毕
+            self.extractor_pool.close(
+                wait=wait,
+                cancel_futures=wait,
+            )
+            self.extractor_pool = None
+
+    async def __finish_detail(
+        self,
+        data: dict,
+        download: bool = False,
+    ) -> dict:
         await self.update_author_nickname(
             data,
         )
@@ -366,30 +466,29 @@ class KS:
         # await self.__save_data(data, "Download")
         return data
 
-    async def __handle_detail_html(
-        self,
-        detail_id: str,
-        url: str,
-        web: bool,
-        proxy: str = "",
-        cookie: str = "",
-    ) -> dict | None:
-        if html := await self.detail_html.run(url, proxy, cookie):
-            return self.extractor_html.run(
-                html,
-                detail_id,
-                web,
-            )
-        return None
-
     async def __save_data(
         self, data: list[dict], name: str, type_="detail", format_="SQLite"
     ) -> None:
-        recorder, params = self.record.run(type_, format_)
-        async with recorder(self.manager, db_name=name, **params) as record:
-            for i in data:
-                i["download"] = " ".join(i["download"])
-                await record.update(i)
+        record = await self.__get_recorder(name, type_, format_)
+        for i in data:
+            i["download"] = " ".join(i["download"])
+            await record.update(i)
+
+    async def __get_recorder(self, name: str, type_: str, format_: str):
+        if record := self.recorders.get(key := (name, type_, format_)):
+            return record
+        async with self.recorders_lock:
+            if not (record := self.recorders.get(key)):
+                recorder, params = self.record.run(type_, format_)
+                record = recorder(self.manager, db_name=name, **params)
+                await record.__aenter__()
+                self.recorders[key] = record
+        return record
+
+    async def __close_recorders(self, exc_type, exc_val, exc_tb):
+        for record in self.recorders.values():
+            await record.__aexit__(exc_type, exc_val, exc_tb)
+        self.recorders.clear()
 
     async def __download_file(
         self,
@@ -430,6 +529,7 @@ class KS:
         self.option["Language"] = language
         await self.database.update_option_data("Language", language)
         self.set_language(language)
+        self.__close_extractor_pool(wait=False)
 
     async def set_language_option(self, language: str) -> str:
         await self._ensure_bootstrap()
@@ -447,6 +547,7 @@ class KS:
         }
 
     async def close(self):
+        self.__close_extractor_pool()
         await self.manager.close()
 
     async def __aenter__(self):
@@ -454,6 +555,7 @@ class KS:
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.__close_recorders(exc_type, exc_val, exc_tb)
         await self.database.__aexit__(exc_type, exc_val, exc_tb)
         await self.close()
 
@@ -495,6 +597,17 @@ class KS:
         async def index():
             return RedirectResponse(url=REPOSITORY)
 
+        @server.get(
+            "/circuit",
+            summary=_("获取请求熔断状态"),
+            description=_(
+                "返回各域名的熔断状态、窗口内请求次数、失败次数与被拒绝的请求次数"
+            ),
+            tags=["Project"],
+        )
+        async def circuit():
+            return self.manager.breaker.snapshot()
+
         @server.post(
             "/share",
             summary=_("获取作品分享链接的重定向链接"),
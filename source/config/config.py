@@ -5,7 +5,21 @@ from yaml import dump, safe_load
 
 from ..static import PROJECT_ROOT
 from ..translation import _
-from ..variable import PC_USERAGENT, RETRY, TIMEOUT
+from ..variable import (
+    BANDWIDTH,
+    CIRCUIT_BREAKER,
+    PACING,
+    CONCURRENCY,
+    DETAIL_CACHE,
+    MEDIA_CLIENT,
+    PAGE_CLIENT,
+    PC_USERAGENT,
+    PIPELINE,
+    RETRY,
+    RETRY_BACKOFF,
+    SQLITE_PRAGMA,
+    TIMEOUT,
+)
 
 if TYPE_CHECKING:
     from ..tools import ColorConsole
@@ -24,14 +38,27 @@ class Config:
         "proxy": None,
         "data_record": False,
         "max_workers": 4,
+        "concurrency": CONCURRENCY,
+        "bandwidth": BANDWIDTH,
+        "segments": 4,
+        "sqlite_pragma": SQLITE_PRAGMA,
+        "pipeline": PIPELINE,
+        "parse_workers": 0,
+        "detail_cache": DETAIL_CACHE,
+        "page_client": PAGE_CLIENT,
+        "media_client": MEDIA_CLIENT,
         "cover": "",
         "music": False,
         "max_retry": RETRY,
+        "retry_backoff": RETRY_BACKOFF,
+        "circuit_breaker": CIRCUIT_BREAKER,
+        "pacing": PACING,
         "timeout": TIMEOUT,
         "chunk": 2 * 1024 * 1024,
         "user_agent": PC_USERAGENT,
         "folder_mode": False,
         "author_archive": True,
+        "dedup": False,
     }
     encode = "UTF-8-SIG" if system() == "Windows" else "UTF-8"
 
@@ -1,16 +1,41 @@
+from importlib.util import find_spec
 from pathlib import Path
-from typing import TYPE_CHECKING
+from re import compile
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 from httpx import HTTPError, TimeoutException, get
 
 from ..static import PROJECT_ROOT
 from ..translation import _
-from ..variable import PC_USERAGENT, RETRY, TIMEOUT
+from ..variable import (
+    BANDWIDTH,
+    CIRCUIT_BREAKER,
+    PACING,
+    CONCURRENCY,
+    DETAIL_CACHE,
+    MEDIA_CLIENT,
+    PAGE_CLIENT,
+    PC_USERAGENT,
+    PIPELINE,
+    RETRY,
+    RETRY_BACKOFF,
+    SQLITE_PRAGMA,
+    TIMEOUT,
+)
 
 if TYPE_CHECKING:
     from ..tools import Cleaner, ColorConsole
 
 
+class Rule(NamedTuple):
+    types: Any
+    minimum: int | float | None = None
+    maximum: int | float | None = None
+    # 为 True 时取值必须大于 minimum
+    strict: bool = False
+    nullable: bool = False
+
+
 class Parameter:
     NO_PROXY = {
         "http://": None,
@@ -24,6 +49,41 @@ class Parameter:
         "作品ID",
         "发布日期",
     }
+    PRAGMA = compile(r"^\w+$")
+    CONCURRENCY_RULES = {
+        "floor": Rule(int, 1),
+        "ceiling": Rule(int, 1, nullable=True),
+    }
+    RETRY_BACKOFF_RULES = {
+        "base": Rule(int | float, 0),
+        "cap": Rule(int | float, 0),
+    }
+    CIRCUIT_BREAKER_RULES = {
+        "threshold": Rule(int | float, 0, 1),
+        "minimum": Rule(int, 1),
+        "window": Rule(int, 1),
+        "cooldown": Rule(int, 1),
+        "probes": Rule(int, 1),
+    }
+    PIPELINE_RULES = {
+        "fetch": Rule(int, 1),
+        "extract": Rule(int, 1),
+        "download": Rule(int, 1),
+        "queue": Rule(int, 1),
+    }
+    DETAIL_CACHE_RULES = {
+        "size": Rule(int, 0),
+        "ttl": Rule(int, 0),
+    }
+    CLIENT_RULES = {
+        "max_connections": Rule(int, 1),
+        "max_keepalive_connections": Rule(int, 0),
+        "keepalive_expiry": Rule(int | float, 0, strict=True),
+        "http2": Rule(bool),
+        "connect_timeout": Rule(int | float, 0, strict=True, nullable=True),
+        "read_timeout": Rule(int | float, 0, strict=True, nullable=True),
+        "pool_timeout": Rule(int | float, 0, strict=True, nullable=True),
+    }
 
     def __init__(
         self,
@@ -37,6 +97,9 @@ class Parameter:
         work_path: str = "",
         timeout=TIMEOUT,
         max_retry=RETRY,
+        retry_backoff: dict = None,
+        circuit_breaker: dict = None,
+        pacing: dict = None,
         proxy: str | dict = None,
         cover="",
         music=False,
@@ -45,7 +108,17 @@ class Parameter:
         user_agent=PC_USERAGENT,
         folder_mode: bool = False,
         author_archive: bool = False,
+        dedup: bool = False,
         max_workers=4,
+        concurrency: dict = None,
+        bandwidth: dict = None,
+        segments=4,
+        sqlite_pragma: dict = None,
+        pipeline: dict = None,
+        parse_workers=0,
+        detail_cache: dict = None,
+        page_client: dict = None,
+        media_client: dict = None,
     ):
         self.root = PROJECT_ROOT
         self.cleaner = cleaner
@@ -53,6 +126,9 @@ class Parameter:
         self.mapping_data = mapping_data or {}
         self.timeout = self.__check_timeout(timeout)
         self.retry = self.__check_max_retry(max_retry)
+        self.retry_backoff = self.__check_retry_backoff(retry_backoff)
+        self.circuit_breaker = self.__check_circuit_breaker(circuit_breaker)
+        self.pacing = self.__check_pacing(pacing)
         self.proxy = self.__check_proxy(proxy)
         self.folder_name = self.__check_folder_name(folder_name)
         self.name_format = self.__check_name_format(name_format)
@@ -65,7 +141,35 @@ class Parameter:
         self.chunk = self.__check_chunk(chunk)
         self.folder_mode = self.check_bool(folder_mode, False)
         self.author_archive = self.check_bool(author_archive, False)
+        self.dedup = self.check_bool(dedup, False)
         self.max_workers = self.__check_max_workers(max_workers)
+        self.concurrency = self.__check_concurrency(concurrency)
+        self.bandwidth = self.__check_bandwidth(bandwidth)
+        self.segments = self.__check_segments(segments)
+        self.sqlite_pragma = self.__check_sqlite_pragma(sqlite_pragma)
+        self.pipeline = self.__check_pipeline(pipeline)
+        self.parse_workers = self.__check_parse_workers(parse_workers)
+        self.detail_cache = self.__check_detail_cache(detail_cache)
+        self.page_client = self.__check_client(
+            "page_client",
+            page_client,
+            PAGE_CLIENT,
+        )
+        self.media_client = self.__check_client(
+            "media_client",
+            media_client,
+            MEDIA_CLIENT,
+        )
+        if (
+            self.media_client["max_connections"]
+            < self.concurrency["ceiling"] * self.segments
+        ):
+            self.console.warning(
+                _(
+                    "media_client 的 max_connections 小于 concurrency.ceiling 与 segments "
+                    "的乘积，部分下载任务需要等待空闲连接"
+                )
+            )
         self.user_agent = user_agent
 
     def run(self) -> dict:
@@ -75,6 +179,9 @@ class Parameter:
             "console": self.console,
             "timeout": self.timeout,
             "max_retry": self.retry,
+            "retry_backoff": self.retry_backoff,
+            "circuit_breaker": self.circuit_breaker,
+            "pacing": self.pacing,
             "proxy": self.proxy,
             "work_path": self.work_path,
             "folder_name": self.folder_name,
@@ -83,6 +190,15 @@ class Parameter:
             "music": self.music,
             "data_record": self.data_record,
             "max_workers": self.max_workers,
+            "concurrency": self.concurrency,
+            "bandwidth": self.bandwidth,
+            "segments": self.segments,
+            "sqlite_pragma": self.sqlite_pragma,
+            "pipeline": self.pipeline,
+            "parse_workers": self.parse_workers,
+            "detail_cache": self.detail_cache,
+            "page_client": self.page_client,
+            "media_client": self.media_client,
             "folder_mode": self.folder_mode,
             "chunk": self.chunk,
             "user_agent": self.user_agent,
@@ -90,6 +206,7 @@ class Parameter:
             "name_length": self.name_length,
             "mapping_data": self.mapping_data,
             "author_archive": self.author_archive,
+            "dedup": self.dedup,
         }
 
     def __check_timeout(self, timeout: int) -> int:
@@ -110,6 +227,215 @@ class Parameter:
         self.console.warning(_("max_workers 参数错误"))
         return 4
 
+    def __check_concurrency(self, concurrency: dict) -> dict:
+        default = CONCURRENCY | {"ceiling": max(self.max_workers, 8)}
+        result = self.__check_settings(
+            "concurrency",
+            concurrency,
+            default,
+            self.CONCURRENCY_RULES,
+        )
+        if result["ceiling"] is None:
+            result["ceiling"] = default["ceiling"]
+        if result["floor"] > result["ceiling"]:
+            self.console.warning(_("concurrency 参数错误"))
+            return default
+        if result["ceiling"] < self.max_workers:
+            self.console.warning(
+                _(
+                    "concurrency 的 ceiling 小于 max_workers，"
+                    "同时下载的文件数量不会超过 {ceiling}"
+                ).format(ceiling=result["ceiling"])
+            )
+        return result
+    def __check_bandwidth(self, bandwidth: dict) -> dict:
+        if bandwidth is None:
+            return BANDWIDTH
+        if not isinstance(bandwidth, dict):
+            self.console.warning(_("bandwidth 参数错误"))
+            return BANDWIDTH
+        result = {"rate": 0, "hosts": {}}
+        for key, value in bandwidth.items():
+            if key == "rate" and self.__check_rate(value):
+                result[key] = value
+            elif key == "hosts" and isinstance(value, dict):
+                for host, rate in value.items():
+                    if isinstance(host, str) and host and self.__check_rate(rate):
+                        result[key][host.lower()] = rate
+                    else:
+                        self.console.warning(
+                            _("bandwidth 参数包含无效设置: {key}").format(key=host)
+                        )
+            else:
+                self.console.warning(
+                    _("bandwidth 参数包含无效设置: {key}").format(key=key)
+                )
+        return result
+
+    @staticmethod
+    def __check_rate(rate: int) -> bool:
+        return isinstance(rate, int) and not isinstance(rate, bool) and rate >= 0
+
+    def __check_retry_backoff(self, retry_backoff: dict) -> dict:
+        return self.__check_settings(
+            "retry_backoff",
+            retry_backoff,
+            RETRY_BACKOFF,
+            self.RETRY_BACKOFF_RULES,
+        )
+    def __check_circuit_breaker(self, circuit_breaker: dict) -> dict:
+        return self.__check_settings(
+            "circuit_breaker",
+            circuit_breaker,
+            CIRCUIT_BREAKER,
+            self.CIRCUIT_BREAKER_RULES,
+        )
+    def __check_pacing(self, pacing: dict) -> dict:
+        if pacing is None:
+            return PACING
+        if not isinstance(pacing, dict):
+            self.console.warning(_("pacing 参数错误"))
+            return PACING
+        result = {
+            "default": PACING["default"],
+            "hosts": PACING["hosts"].copy(),
+        }
+        # 先处理 default，新增域名以其为默认值
+        for key, value in sorted(pacing.items(), key=lambda i: i[0] != "default"):
+            if key == "default" and (item := self.__check_pace(value, result[key])):
+                result[key] = item
+            elif key == "hosts" and isinstance(value, dict):
+                for host, settings in value.items():
+                    default = result[key].get(host, result["default"])
+                    if isinstance(host, str) and (
+                        item := self.__check_pace(settings, default)
+                    ):
+                        result[key][host.lower()] = item
+                    else:
+                        self.console.warning(
+                            _("pacing 参数包含无效设置: {key}").format(key=host)
+                        )
+            else:
+                self.console.warning(
+                    _("pacing 参数包含无效设置: {key}").format(key=key)
+                )
+        return result
+
+    @staticmethod
+    def __check_pace(settings: dict, default: dict) -> dict | None:
+        if not isinstance(settings, dict):
+            return None
+        result = default.copy()
+        for key, value in settings.items():
+            if (
+                key not in default
+                or not isinstance(value, int | float)
+                or isinstance(value, bool)
+                or value < 0
+            ):
+                return None
+            result[key] = value
+        return result
+
+    def __check_segments(self, segments: int) -> int:
+        if self.__check_value(segments, Rule(int, 1)):
+            return segments
+        self.console.warning(_("segments 参数错误"))
+        return 4
+    def __check_parse_workers(self, parse_workers: int) -> int:
+        if self.__check_value(parse_workers, Rule(int, 0)):
+            return parse_workers
+        self.console.warning(_("parse_workers 参数错误"))
+        return 0
+    def __check_sqlite_pragma(self, sqlite_pragma: dict) -> dict:
+        if sqlite_pragma is None:
+            return SQLITE_PRAGMA
+        if not isinstance(sqlite_pragma, dict):
+            self.console.warning(_("sqlite_pragma 参数错误"))
+            return SQLITE_PRAGMA
+        result = SQLITE_PRAGMA.copy()
+        for key, value in sqlite_pragma.items():
+            if (
+                isinstance(key, str)
+                and isinstance(value, str | int)
+                and not isinstance(value, bool)
+                and self.PRAGMA.match(key)
+                and self.PRAGMA.match(str(value).lstrip("-"))
+            ):
+                result[key] = value
+            else:
+                self.console.warning(
+                    _("sqlite_pragma 参数包含无效设置: {key}").format(key=key)
+                )
+        return result
+
+    def __check_pipeline(self, pipeline: dict) -> dict:
+        return self.__check_settings(
+            "pipeline",
+            pipeline,
+            PIPELINE,
+            self.PIPELINE_RULES,
+        )
+    def __check_detail_cache(self, detail_cache: dict) -> dict:
+        return self.__check_settings(
+            "detail_cache",
+            detail_cache,
+            DETAIL_CACHE,
+            self.DETAIL_CACHE_RULES,
+        )
+    def __check_client(self, name: str, client: dict, default: dict) -> dict:
+        result = self.__check_settings(
+            name,
+            client,
+            default,
+            self.CLIENT_RULES,
+        )
+        if result["http2"] and not find_spec("h2"):
+            self.console.warning(
+                _("{name} 启用 HTTP/2 需要安装 h2 模块，已改为使用 HTTP/1.1").format(
+                    name=name
+                )
+            )
+            result["http2"] = False
+        for key in ("connect_timeout", "read_timeout", "pool_timeout"):
+            if result[key] is None:
+                result[key] = self.timeout
+        return result
+
+    def __check_settings(
+        self,
+        name: str,
+        settings: dict,
+        default: dict,
+        rules: dict[str, Rule],
+    ) -> dict:
+        if settings is None:
+            return default.copy()
+        if not isinstance(settings, dict):
+            self.console.warning(_("{name} 参数错误").format(name=name))
+            return default.copy()
+        result = default.copy()
+        for key, value in settings.items():
+            if (rule := rules.get(key)) and self.__check_value(value, rule):
+                result[key] = value
+            else:
+                self.console.warning(
+                    _("{name} 参数包含无效设置: {key}").format(name=name, key=key)
+                )
+        return result
+
+    @staticmethod
+    def __check_value(value: Any, rule: Rule) -> bool:
+        if value is None:
+            return rule.nullable
+        # bool 是 int 的子类，仅在明确允许时接受
+        if isinstance(value, bool) or not isinstance(value, rule.types):
+            return isinstance(value, bool) and rule.types is bool
+        if rule.minimum is not None and (
+            value <= rule.minimum if rule.strict else value < rule.minimum
+        ):
+            return False
+        return rule.maximum is None or value <= rule.maximum
     def __check_proxy(
         self,
         proxy: str,
@@ -1,10 +1,14 @@
-from asyncio import Semaphore, gather
+from asyncio import TaskGroup, gather, to_thread
+from contextlib import contextmanager
+from hashlib import blake2b
+from json import dumps, loads
+from os import link, replace
 from pathlib import Path
 from shutil import move
 from typing import TYPE_CHECKING
 from typing import Callable
 from aiofiles import open
-from httpx import HTTPError
+from httpx import HTTPError, HTTPStatusError, TimeoutException
 from rich.progress import (
     BarColumn,
     DownloadColumn,
@@ -14,15 +18,17 @@ from rich.progress import (
     TimeRemainingColumn,
 )
 
-from ..module import CacheError
+from ..module import CacheError, RangeIgnoredError
 from ..tools import (
     PROGRESS,
+    AdaptiveLimiter,
     beautify_string,
     capture_error_request,
     retry_request,
     FakeProgress,
 )
 from ..translation import _
+from ..variable import FILE_SIGNATURES, FILE_SIGNATURES_LENGTH
 
 if TYPE_CHECKING:
     from ..manager import Manager
@@ -39,6 +45,11 @@ class Downloader:
         "audio/mp4": "m4a",
         "audio/mpeg": "mp3",
     }
+    SEGMENT_THRESHOLD = 32 * 1024 * 1024
+    # 实际后缀以文件签名为准，判断文件是否存在时需要匹配同类后缀
+    VIDEO_SUFFIXES = ("mp4", "m4v", "mov", "mkv", "flv", "avi", "mpg")
+    IMAGE_SUFFIXES = ("jpeg", "png", "webp", "avif", "heic")
+    AUDIO_SUFFIXES = ("m4a", "mp3")
 
     def __init__(
         self,
@@ -48,24 +59,34 @@ class Downloader:
     ):
         self.path = manager.path
         self.folder = manager.folder
-        self.client = manager.client
+        self.client = manager.media_client
         self.headers = manager.pc_download_headers
         self.cleaner = manager.cleaner
         self.cover = manager.cover
         self.music = manager.music
         self.console = manager.console
-        self.retry = manager.max_retry
+        self.retry_policy = manager.retry_policy
         self.temp = manager.temp
         self.folder_mode = manager.folder_mode
         self.author_archive = manager.author_archive
+        self.dedup = manager.dedup
         self.chunk = manager.chunk
-        self.semaphore = Semaphore(manager.max_workers)
+        self.segments = manager.segments
+        self.bandwidth = manager.bandwidth
+        self.breaker = manager.breaker
+        self.limiter = AdaptiveLimiter(
+            manager.concurrency["floor"],
+            manager.concurrency["ceiling"],
+            manager.max_workers,
+        )
         self.database = database
         self.name_format = manager.name_format
         self.name_length = manager.name_length
         self.general_progress_object: Callable = self.init_general_progress(
             server_mode,
         )
+        self.__progress = None
+        self.__progress_users = 0
 
     def init_general_progress(
         self,
@@ -75,6 +96,21 @@ class Downloader:
             return self.__fake_progress_object
         return self.__general_progress_object
 
+    @contextmanager
+    def __shared_progress(self):
+        # 同一时间仅允许存在一个进度条实例，并发下载任务共享该实例
+        if not self.__progress_users:
+            self.__progress = self.general_progress_object()
+            self.__progress.__enter__()
+        self.__progress_users += 1
+        try:
+            yield self.__progress
+        finally:
+            self.__progress_users -= 1
+            if not self.__progress_users:
+                self.__progress.__exit__(None, None, None)
+                self.__progress = None
+
     @staticmethod
     def __fake_progress_object(*args, **kwargs,):
         return FakeProgress()
@@ -118,9 +154,12 @@ class Downloader:
         data: list[dict],
     ):
         tasks = []
-        with self.general_progress_object() as progress:
+        downloaded = await self.database.filter_downloaded(
+            [i["detailID"] for i in data],
+        )
+        with self.__shared_progress() as progress:
             for item in data:
-                if await self.database.has_download_data(i := item["detailID"]):
+                if (i := item["detailID"]) in downloaded:
                     self.console.info(
                         _("作品 {detail_id} 存在下载记录，跳过下载！").format(
                             detail_id=i
@@ -170,7 +209,7 @@ class Downloader:
         if not self.music or not (m := data.get("audioUrls")):
             return
         file = self.__generate_path(nickname, filename)
-        if not self.__file_exists(file, "m4a"):
+        if not self.__file_exists(file, self.AUDIO_SUFFIXES):
             tasks.append(
                 self.__download_file(
                     m.split()[0],
@@ -191,7 +230,7 @@ class Downloader:
         progress: Progress,
     ):
         file = self.__generate_path(nickname, filename)
-        if not self.__file_exists(file, "mp4"):
+        if not self.__file_exists(file, self.VIDEO_SUFFIXES):
             tasks.append(
                 self.__download_file(
                     data["download"][0],
@@ -217,7 +256,7 @@ class Downloader:
             file = self.__generate_path(nickname, f"{filename}_{index}")
             if not self.__file_exists(
                 file,
-                "webp",
+                self.IMAGE_SUFFIXES,
             ):
                 tasks.append(
                     self.__download_file(
@@ -239,7 +278,7 @@ class Downloader:
     ):
         match self.cover:
             case "WEBP":
-                if not self.__file_exists(path, "webp"):
+                if not self.__file_exists(path, self.IMAGE_SUFFIXES):
                     tasks.append(
                         self.__download_file(
                             data.get("webpCoverUrls"),
@@ -251,7 +290,7 @@ class Downloader:
                         )
                     )
             case "JPEG":
-                if not self.__file_exists(path, "jpeg"):
+                if not self.__file_exists(path, self.IMAGE_SUFFIXES):
                     tasks.append(
                         self.__download_file(
                             data.get("coverUrls"),
@@ -276,7 +315,7 @@ class Downloader:
         tip: str = "",
         suffix: str = ...,
     ):
-        async with self.semaphore:
+        async with self.limiter:
             text = beautify_string(path.name, 50)
             if not url:
                 self.console.warning(
@@ -284,55 +323,392 @@ class Downloader:
                 )
                 return True
             headers = self.headers.copy()
-            # length, suffix = await self.__head_file(url, headers, suffix, )
             temp = self.temp.joinpath(f"{path.name}.{suffix}")
-            position = self.__update_headers_range(
+            async with self.breaker.guard(url):
+                try:
+                    if state := self.__load_segment_state(temp):
+                        path, size, digest = await self.__download_segments(
+                            url,
+                            headers,
+                            temp,
+                            path,
+                            progress,
+                            tip,
+                            text,
+                            state,
+                        )
+                    else:
+                        path, size, digest = await self.__download_stream(
+                            url,
+                            headers,
+                            temp,
+                            path,
+                            progress,
+                            tip,
+                            text,
+                            suffix,
+                        )
+                except HTTPError as e:
+                    if self.__throttled(e):
+                        self.limiter.penalize()
+                    await self.database.delete_download_data(id_)
+                    raise HTTPError(repr(e)) from e
+            if not (
+                self.dedup and await self.__link_duplicate(temp, path, size, digest)
+            ):
+                self.move(temp, path)
+            self.console.info(
+                _("【{type}】{name} 下载完成").format(type=tip, name=text)
+            )
+            await self.database.write_download_data(id_)
+            await self.database.write_file_data(
+                str(path.resolve()),
+                id_,
+                size,
+                digest,
+            )
+            return True
+
+    async def __download_stream(
+        self,
+        url: str,
+        headers: dict,
+        temp: "Path",
+        path: "Path",
+        progress: Progress,
+        tip: str,
+        text: str,
+        suffix: str,
+        segment: bool = True,
+    ) -> tuple["Path", int, str]:
+        position = self.__update_headers_range(
+            headers,
+            temp,
+        )
+        async with self.client.stream(
+            "GET",
+            url,
+            headers=headers,
+        ) as response:
+            # 服务器忽略 Range 时返回完整文件，不能追加到缓存文件
+            if response.status_code == 416 or (
+                position and response.status_code == 200
+            ):
+                self.delete(temp)
+                raise CacheError(
+                    _("【{type}】{name} 缓存异常，重新下载").format(type=tip, name=text)
+                )
+            response.raise_for_status()
+            length, suffix = self._extract_content(
+                response.headers,
+                suffix,
+            )
+            state = None
+            # 首次请求的响应头表明支持分段时，放弃当前响应改为分段下载
+            if segment and not position:
+                state = await self.__plan_segments(
+                    temp,
+                    response.status_code,
+                    response.headers,
+                    length,
+                    suffix,
+                )
+            if not state:
+                length += position
+                task_id = progress.add_task(
+                    f"【{tip}】{text}",
+                    total=length or None,
+                    completed=position,
+                )
+                host = response.url.host
+                if position:
+                    head = await self.__read_head(temp)
+                    hasher = await to_thread(self.__hash_file, temp)
+                else:
+                    head = b""
+                    hasher = self.__hasher()
+                size = position
+                async with open(temp, "ab") as f:
+                    async for chunk in response.aiter_bytes(self.chunk):
+                        if len(head) < FILE_SIGNATURES_LENGTH:
+                            head += chunk[: FILE_SIGNATURES_LENGTH - len(head)]
+                        if self.bandwidth.enabled:
+                            await self.bandwidth.consume(host, len(chunk))
+                        await f.write(chunk)
+                        hasher.update(chunk)
+                        size += len(chunk)
+                        self.limiter.feed(len(chunk))
+                        progress.update(task_id, advance=len(chunk))
+                # 压缩传输时 Content-Length 为压缩后的大小，无法用于校验
+                if (
+                    length
+                    and size != length
+                    and "Content-Encoding" not in response.headers
+                ):
+                    self.__size_mismatch(temp, tip, text)
+        if state:
+            return await self.__download_segments(
+                url,
                 headers,
                 temp,
+                path,
+                progress,
+                tip,
+                text,
+                state,
             )
+        suffix = self.__sniff_type(
+            head,
+            suffix,
+            response.headers.get("Content-Type"),
+        )
+        return path.with_name(f"{path.name}.{suffix}"), size, hasher.hexdigest()
+
+    def __load_segment_state(self, temp: "Path") -> dict | None:
+        state_file = self.__segment_state_file(temp)
+        if not state_file.is_file():
+            return None
+        if temp.is_file():
             try:
-                async with self.client.stream(
-                    "GET",
-                    url,
-                    headers=headers,
-                ) as response:
-                    if response.status_code == 416:
-                        self.delete(temp)
-                        raise CacheError(
-                            _("【{type}】{name} 缓存异常，重新下载").format(
-                                type=tip, name=text
-                            )
+                return loads(state_file.read_text(encoding="utf-8"))
+            except ValueError:
+                # 状态文件损坏时无法确认已下载的范围，删除缓存重新下载
+                self.delete(temp)
+        self.delete(state_file)
+        self.delete(self.__segment_state_temp(state_file))
+        return None
+
+    async def __plan_segments(
+        self,
+        temp: "Path",
+        status: int,
+        headers,
+        length: int,
+        suffix: str,
+    ) -> dict | None:
+        if (
+            self.segments < 2
+            or length < self.SEGMENT_THRESHOLD
+            or "Content-Encoding" in headers
+            or (status != 206 and headers.get("Accept-Ranges") != "bytes")
+        ):
+            return None
+        size = -(-length // self.segments)
+        state = {
+            "length": length,
+            "suffix": suffix,
+            # 分别为起始位置、结束位置、已下载字节数
+            "segments": [
+                [start, min(start + size, length) - 1, 0]
+                for start in range(0, length, size)
+            ],
+        }
+        # 先写入状态文件，避免缓存文件已预分配但状态文件缺失
+        self.__save_segment_state(self.__segment_state_file(temp), state)
+        async with open(temp, "wb") as f:
+            await f.truncate(length)
+        return state
+
+    async def __download_segments(
+        self,
+        url: str,
+        headers: dict,
+        temp: "Path",
+        path: "Path",
+        progress: Progress,
+        tip: str,
+        text: str,
+        state: dict,
+    ) -> tuple["Path", int, str]:
+        task_id = progress.add_task(
+            f"【{tip}】{text}",
+            total=state["length"],
+            completed=sum(i[2] for i in state["segments"]),
+        )
+        try:
+            # 任意分段失败时取消其余分段，全部停止后再处理缓存文件
+            async with TaskGroup() as group:
+                for index in range(len(state["segments"])):
+                    group.create_task(
+                        self.__download_segment(
+                            url,
+                            headers,
+                            temp,
+                            state,
+                            index,
+                            progress,
+                            task_id,
+                            tip,
+                            text,
                         )
-                    response.raise_for_status()
-                    length, suffix = self._extract_content(
-                        response.headers,
-                        suffix,
                     )
-                    length += position
-                    path = path.with_name(f"{path.name}.{suffix}")
-                    task_id = progress.add_task(
-                        f"【{tip}】{text}",
-                        total=length or None,
-                        completed=position,
+        except BaseExceptionGroup as errors:
+            error = errors.exceptions[0]
+            if not isinstance(error, CacheError):
+                raise error
+            self.delete(temp)
+            self.delete(self.__segment_state_file(temp))
+            if not isinstance(error, RangeIgnoredError):
+                raise error
+            progress.remove_task(task_id)
+            return await self.__download_stream(
+                url,
+                headers,
+                temp,
+                path,
+                progress,
+                tip,
+                text,
+                state["suffix"],
+                False,
+            )
+        if (size := temp.stat().st_size) != state["length"] or any(
+            start + done <= end for start, end, done in state["segments"]
+        ):
+            self.__size_mismatch(temp, tip, text)
+        self.__segment_state_file(temp).unlink()
+        suffix = self.__sniff_type(
+            await self.__read_head(temp),
+            state["suffix"],
+        )
+        hasher = await to_thread(self.__hash_file, temp)
+        return path.with_name(f"{path.name}.{suffix}"), size, hasher.hexdigest()
+
+    async def __download_segment(
+        self,
+        url: str,
+        headers: dict,
+        temp: "Path",
+        state: dict,
+        index: int,
+        progress: Progress,
+        task_id,
+        tip: str,
+        text: str,
+    ) -> None:
+        segment = state["segments"][index]
+        start, end, done = segment
+        if start + done > end:
+            return
+        async with self.client.stream(
+            "GET",
+            url,
+            headers=headers | {"Range": f"bytes={start + done}-{end}"},
+        ) as response:
+            if response.status_code == 200:
+                raise RangeIgnoredError(
+                    _("【{type}】{name} 服务器不支持分段下载").format(
+                        type=tip, name=text
                     )
-                    async with open(temp, "ab") as f:
-                        async for chunk in response.aiter_bytes(self.chunk):
-                            await f.write(chunk)
-                            progress.update(task_id, advance=len(chunk))
-            except HTTPError as e:
-                await self.database.delete_download_data(id_)
-                raise HTTPError(repr(e)) from e
-            self.move(temp, path)
+                )
+            if response.status_code == 416:
+                raise CacheError(
+                    _("【{type}】{name} 缓存异常，重新下载").format(type=tip, name=text)
+                )
+            response.raise_for_status()
+            state_file = self.__segment_state_file(temp)
+            host = response.url.host
+            async with open(temp, "r+b") as f:
+                await f.seek(start + done)
+                async for chunk in response.aiter_bytes(self.chunk):
+                    if self.bandwidth.enabled:
+                        await self.bandwidth.consume(host, len(chunk))
+                    await f.write(chunk)
+                    await f.flush()
+                    segment[2] += len(chunk)
+                    self.limiter.feed(len(chunk))
+                    self.__save_segment_state(state_file, state)
+                    progress.update(task_id, advance=len(chunk))
+
+    @staticmethod
+    def __throttled(error: HTTPError) -> bool:
+        if isinstance(error, TimeoutException):
+            return True
+        if isinstance(error, HTTPStatusError):
+            status = error.response.status_code
+            return status == 429 or status >= 500
+        return False
+
+    @staticmethod
+    def __segment_state_file(temp: "Path") -> "Path":
+        return temp.with_name(f"{temp.name}.json")
+
+    @staticmethod
+    def __segment_state_temp(file: "Path") -> "Path":
+        return file.with_name(f"{file.name}.tmp")
+
+    def __save_segment_state(self, file: "Path", state: dict) -> None:
+        # 写入临时文件后原子替换，避免中断时留下不完整的状态文件
+        temp = self.__segment_state_temp(file)
+        temp.write_text(dumps(state), encoding="utf-8")
+        replace(temp, file)
+
+    def __extract_type(self, content: str) -> str:
+        return self.CONTENT_TYPE_MAP.get(content, "")
+
+    def __sniff_type(
+        self,
+        head: bytes,
+        suffix: str,
+        content: str = None,
+    ) -> str:
+        for offset, signature, type_ in FILE_SIGNATURES:
+            if head[offset : offset + len(signature)] == signature:
+                return type_
+        if content and content not in self.CONTENT_TYPE_MAP:
+            self.__unknown_type(content)
+        return suffix
+
+    async def __link_duplicate(
+        self,
+        temp: "Path",
+        path: "Path",
+        size: int,
+        digest: str,
+    ) -> bool:
+        target = str(path.resolve())
+        for source in await self.database.find_file_data(digest, size):
+            if source == target:
+                continue
+            try:
+                if Path(source).stat().st_size != size:
+                    continue
+                link(source, path)
+            except OSError:
+                # 文件已删除、跨文件系统或不支持硬链接时尝试下一个文件，最终回退为移动文件
+                continue
+            self.delete(temp)
             self.console.info(
-                _("【{type}】{name} 下载完成").format(type=tip, name=text)
+                _("{name} 与已下载的文件 {source} 相同，已创建硬链接").format(
+                    name=path.name,
+                    source=source,
+                )
             )
-            await self.database.write_download_data(id_)
             return True
+        return False
 
-    def __extract_type(self, content: str) -> str:
-        if not (s := self.CONTENT_TYPE_MAP.get(content)):
-            return self.__unknown_type(content)
-        return s
+    @staticmethod
+    def __hasher():
+        return blake2b(digest_size=32)
+
+    def __hash_file(self, file: "Path"):
+        hasher = self.__hasher()
+        with file.open("rb") as f:
+            while chunk := f.read(self.chunk):
+                hasher.update(chunk)
+        return hasher
+
+    def __size_mismatch(self, temp: "Path", tip: str, text: str) -> None:
+        self.delete(temp)
+        self.delete(self.__segment_state_file(temp))
+        raise CacheError(
+            _("【{type}】{name} 文件大小校验失败，重新下载").format(type=tip, name=text)
+        )
+
+    @staticmethod
+    async def __read_head(file: "Path") -> bytes:
+        async with open(file, "rb") as f:
+            return await f.read(FILE_SIGNATURES_LENGTH)
 
     def __unknown_type(self, content: str) -> str:
         self.console.error(
@@ -351,10 +727,12 @@ class Downloader:
     def move(temp: "Path", path: "Path"):
         move(temp.resolve(), path.resolve())
 
-    def __file_exists(self, path: "Path", suffix="*") -> bool:
-        if e := any(path.parent.glob(n := f"{path.name}.{suffix}")):
-            self.console.info(_("{filename} 已存在，跳过下载").format(filename=n))
-        return e
+    def __file_exists(self, path: "Path", suffixes: tuple[str, ...] = ("*",)) -> bool:
+        for suffix in suffixes:
+            if any(path.parent.glob(n := f"{path.name}.{suffix}")):
+                self.console.info(_("{filename} 已存在，跳过下载").format(filename=n))
+                return True
+        return False
 
     def __generate_name(
         self,
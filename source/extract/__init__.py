@@ -1,2 +1,3 @@
 from .extractor import APIExtractor
 from .extractor import HTMLExtractor
+from .pool import ExtractorPool
@@ -1,14 +1,18 @@
 from datetime import datetime
 from re import compile
 from time import localtime, strftime
-from types import SimpleNamespace
 from typing import TYPE_CHECKING
 from urllib.parse import parse_qs
 
 from lxml.etree import HTML
 from yaml import safe_load
 
-from ..tools import Namespace
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
+
+from ..tools import DataView, ListView, Namespace
 from ..translation import _
 
 if TYPE_CHECKING:
@@ -17,6 +21,7 @@ if TYPE_CHECKING:
 
 class HTMLExtractor:
     SCRIPT = "//script/text()"
+    SCRIPT_END = "</script>"
     WEB_KEYWORD = "window.__APOLLO_STATE__="
     APP_KEYWORD = "window.INIT_STATE = "
     PHOTO_REGEX = compile(r"\"photo\":(\{\".*\"}),\"serialInfo\"")
@@ -43,11 +48,13 @@ class HTMLExtractor:
         if not data:
             self.console.warning(_("提取网页数据失败"))
             return {}
+        entities = self._index_entities(data.get("defaultClient")) if web else {}
         data = Namespace(data)
         return self.__extract_detail(
             data,
             id_,
             web,
+            entities,
         )
 
     def __extract_object(
@@ -58,6 +65,11 @@ class HTMLExtractor:
         if not html:
             self.console.warning(_("获取网页内容失败"))
             return ""
+        if text := self.__scan_object(
+            html,
+            self.WEB_KEYWORD if web else self.APP_KEYWORD,
+        ):
+            return text
         html_tree = HTML(html)
         if not (data := html_tree.xpath(self.SCRIPT)):
             return ""
@@ -67,6 +79,39 @@ class HTMLExtractor:
                 return i
         raise ValueError(_("提取网页数据失败"))
 
+    def __scan_object(
+        self,
+        html: str,
+        keyword: str,
+    ) -> str:
+        if (start := html.find(keyword)) == -1:
+            return ""
+        if (end := html.find(self.SCRIPT_END, start)) == -1:
+            return ""
+        if (end := self.__match_bracket(html, start + len(keyword), end)) == -1:
+            return ""
+        return html[start:end]
+
+    @staticmethod
+    def __match_bracket(
+        text: str,
+        start: int,
+        end: int,
+    ) -> int:
+        # 从脚本末尾向前匹配括号，跳过数据对象之后的代码，返回数据对象的结束位置
+        depth = 0
+        for index in range(end - 1, start - 1, -1):
+            match text[index]:
+                case "}" if not depth:
+                    return index + 1
+                case ")" | "]" | "}":
+                    depth += 1
+                case "(" | "[" | "{":
+                    if not depth:
+                        return -1
+                    depth -= 1
+        return -1
+
     def __convert_object(
         self,
         text: str,
@@ -81,16 +126,32 @@ class HTMLExtractor:
             )
         else:
             text = text[1] if (text := self.PHOTO_REGEX.search(text)) else ""
-        return safe_load(text)
+        try:
+            return loads(text)
+        except ValueError:
+            return safe_load(text)
+
+    @staticmethod
+    def _index_entities(client: dict) -> dict[str, list[str]]:
+        # 按实体类型索引页面数据的顶层键，例如 VisionVideoDetailAuthor: [键名, ...]
+        entities = {}
+        if not isinstance(client, dict):
+            return entities
+        for key in client:
+            type_, separator, __ = key.partition(":")
+            if separator:
+                entities.setdefault(type_, []).append(key)
+        return entities
 
     def __extract_detail(
         self,
         data: Namespace,
         id_: str,
         web: bool,
+        entities: dict[str, list[str]],
     ) -> dict:
         return (
-            self.__extract_detail_web(data, id_)
+            self.__extract_detail_web(data, id_, entities)
             if web
             else self.__extract_detail_app(
                 data,
@@ -155,58 +216,64 @@ class HTMLExtractor:
             ),
         }
 
-    def __extract_detail_web(self, data: Namespace, id_: str) -> dict:
+    def __extract_detail_web(
+        self,
+        data: Namespace,
+        id_: str,
+        entities: dict[str, list[str]],
+    ) -> dict:
         data = data.safe_extract("defaultClient")
-        detail = f"VisionVideoDetailPhoto:{id_}"
-        if not Namespace.object_extract(data, detail):
+        if not (
+            detail := Namespace.object_extract(data, f"VisionVideoDetailPhoto:{id_}")
+        ):
             return {}
         container = {
             "collection_time": datetime.now().strftime(self.date_format),
             "photoType": _("视频"),
             "detailID": id_,
             "caption": Namespace.object_extract(
-                data,
-                f"{detail}.caption",
+                detail,
+                "caption",
             ),
             "coverUrl": Namespace.object_extract(
-                data,
-                f"{detail}.coverUrl",
+                detail,
+                "coverUrl",
             ),
             "duration": APIExtractor.time_conversion(
                 Namespace.object_extract(
-                    data,
-                    f"{detail}.duration",
+                    detail,
+                    "duration",
                     0,
                 )
             ),
             "realLikeCount": Namespace.object_extract(
-                data,
-                f"{detail}.realLikeCount",
+                detail,
+                "realLikeCount",
                 -1,
             ),
             "download": [
                 Namespace.object_extract(
-                    data,
-                    f"{detail}.photoUrl",
+                    detail,
+                    "photoUrl",
                 )
             ],
             "timestamp": APIExtractor.format_date(
                 Namespace.object_extract(
-                    data,
-                    f"{detail}.timestamp",
+                    detail,
+                    "timestamp",
                     0,
                 ),
                 self.date_format,
             ),
             "viewCount": Namespace.object_extract(
-                data,
-                f"{detail}.viewCount",
+                detail,
+                "viewCount",
                 -1,
             ),
             "shareCount": -1,
             "commentCount": -1,
         }
-        self.__extract_author_web(container, data)
+        self.__extract_author_web(container, data, entities)
         return container
 
     @staticmethod
@@ -227,10 +294,15 @@ class HTMLExtractor:
         return [f"https://{cdn}{i}" for i in list_]
 
     @staticmethod
-    def __extract_author_web(container: dict, data: Namespace) -> None:
-        author = next(
-            (getattr(data, i) for i in dir(data) if "VisionVideoDetailAuthor:" in i),
-            None,
+    def __extract_author_web(
+        container: dict,
+        data: DataView,
+        entities: dict[str, list[str]],
+    ) -> None:
+        author = (
+            getattr(data, min(keys))
+            if (keys := entities.get("VisionVideoDetailAuthor"))
+            else None
         )
         container["authorID"] = Namespace.object_extract(
             author,
@@ -261,31 +333,20 @@ class APIExtractor:
         self.cleaner = manager.cleaner
 
     @staticmethod
-    def generate_data_object(data: dict) -> SimpleNamespace | list[SimpleNamespace]:
+    def generate_data_object(data: dict) -> DataView | ListView:
         return Namespace.generate_data_object(data)
 
     @staticmethod
     def safe_extract(
-        data: SimpleNamespace,
+        data: DataView,
         attribute_chain: str,
-        default: str | int | list | dict | SimpleNamespace = "",
+        default: str | int | list | dict | DataView = "",
     ):
-        attributes = attribute_chain.split(".")
-        for attribute in attributes:
-            if "[" in attribute:
-                parts = attribute.split("[", 1)
-                attribute = parts[0]
-                index = parts[1].split("]", 1)[0]
-                try:
-                    index = int(index)
-                    data = getattr(data, attribute, None)[index]
-                except (IndexError, TypeError, ValueError):
-                    return default
-            else:
-                data = getattr(data, attribute, None)
-                if not data:
-                    return default
-        return data or default
+        return Namespace.object_extract(
+            data,
+            attribute_chain,
+            default,
+        )
 
     def run(self, data: list[dict], type_="detail") -> list[dict]:
         container = []
@@ -303,7 +364,7 @@ class APIExtractor:
                 raise ValueError
         return container
 
-    def __extract_items(self, container: list, data: SimpleNamespace) -> None:
+    def __extract_items(self, container: list, data: DataView) -> None:
         item = {
             "collection_time": datetime.now().strftime(self.date_format),
         }
@@ -321,16 +382,16 @@ class APIExtractor:
             item["download"] = ""
         container.append(item)
 
-    def __extract_comments(self, item: dict, data: SimpleNamespace) -> None:
+    def __extract_comments(self, item: dict, data: DataView) -> None:
         pass
 
-    def __extract_counts(self, item: dict, data: SimpleNamespace) -> None:
+    def __extract_counts(self, item: dict, data: DataView) -> None:
         item["fanCount"] = self.safe_extract(data, "counts.fanCount", -1)
         item["followCount"] = self.safe_extract(data, "counts.followCount", -1)
         item["collectionCount"] = self.safe_extract(data, "counts.collectionCount", -1)
         item["photoCount"] = self.safe_extract(data, "counts.photoCount", -1)
 
-    def __extract_photo(self, item: dict, data: SimpleNamespace) -> None:
+    def __extract_photo(self, item: dict, data: DataView) -> None:
         photo = self.safe_extract(data, "photo")
         item["timestamp"] = self.format_date(
             self.safe_extract(photo, "timestamp", 0),
@@ -356,7 +417,7 @@ class APIExtractor:
     def __extract_music(
         self,
         item: dict,
-        data: SimpleNamespace,
+        data: DataView,
         video=True,
     ) -> None:
         if video:
@@ -374,7 +435,7 @@ class APIExtractor:
         parsed = parse_qs(share)
         return parsed.get("photoId", ["Unknown"])[0]
 
-    def __extract_cover(self, item: dict, photo: SimpleNamespace, index=0) -> None:
+    def __extract_cover(self, item: dict, photo: DataView, index=0) -> None:
         cover_urls = self.safe_extract(
             photo,
             "coverUrls",
@@ -391,10 +452,10 @@ class APIExtractor:
         )
         item["headUrls"] = head_urls[index].url if head_urls else ""
 
-    def __extract_mp4(self, item: dict, data: SimpleNamespace) -> None:
+    def __extract_mp4(self, item: dict, data: DataView) -> None:
         item["download"] = self.safe_extract(data, "mp4Url")
 
-    def __extract_atlas(self, item: dict, data: SimpleNamespace, index=0) -> None:
+    def __extract_atlas(self, item: dict, data: DataView, index=0) -> None:
         try:
             cdn = self.safe_extract(data, "atlas.cdn")
             cdn = cdn[index]
@@ -0,0 +1,81 @@
+from asyncio import get_running_loop
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from types import SimpleNamespace
+
+from ..tools import Cleaner, ColorConsole
+from ..translation import switch_language
+from .extractor import HTMLExtractor
+
+__all__ = ["ExtractorPool"]
+
+# 子进程内的解析器实例，由 _initialize 创建
+_extractor: HTMLExtractor | None = None
+
+
+def _initialize(language: str) -> None:
+    global _extractor
+    switch_language(language)
+    _extractor = HTMLExtractor(
+        SimpleNamespace(
+            console=ColorConsole(),
+            cleaner=Cleaner(),
+        )
+    )
+
+
+def _extract(
+    html: str,
+    id_: str,
+    web: bool,
+) -> dict:
+    return _extractor.run(
+        html,
+        id_,
+        web,
+    )
+
+
+class ExtractorPool:
+    """Runs ``HTMLExtractor.run`` in worker processes.
+
+    Args:
+        max_workers: Number of worker processes.
+        language: Language the workers translate messages into.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        language: str,
+    ):
+        self.executor = ProcessPoolExecutor(
+            max_workers,
+            mp_context=get_context("spawn"),
+            initializer=_initialize,
+            initargs=(language,),
+        )
+
+    async def run(
+        self,
+        html: str,
+        id_: str,
+        web: bool,
+    ) -> dict:
+        return await get_running_loop().run_in_executor(
+            self.executor,
+            _extract,
+            html,
+            id_,
+            web,
+        )
+
+    def close(
+        self,
+        wait: bool = True,
+        cancel_futures: bool = True,
+    ) -> None:
+        self.executor.shutdown(
+            wait=wait,
+            cancel_futures=cancel_futures,
+        )
@@ -0,0 +1,58 @@
+from collections import OrderedDict
+from time import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..module import Database
+
+__all__ = ["RedirectCache"]
+
+
+class RedirectCache:
+    TTL = 7 * 24 * 60 * 60
+    SIZE = 1024
+    # 每隔 PURGE_INTERVAL 秒清理一次数据库中的过期记录
+    PURGE_INTERVAL = 60 * 60
+
+    def __init__(
+        self,
+        database: "Database",
+        ttl: int = TTL,
+        size: int = SIZE,
+    ):
+        self.database = database
+        self.ttl = ttl
+        self.size = size
+        self.__cache: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self.__purged = 0.0
+
+    async def get(self, url: str) -> str:
+        now = time()
+        await self.__purge(now)
+        if item := self.__cache.get(url):
+            if now - item[1] < self.ttl:
+                self.__cache.move_to_end(url)
+                return item[0]
+            del self.__cache[url]
+        row = await self.database.read_redirect_data(url)
+        if row and now - row["TIME"] < self.ttl:
+            self.__remember(url, row["TARGET"], row["TIME"])
+            return row["TARGET"]
+        return ""
+
+    async def set(self, url: str, target: str) -> None:
+        now = time()
+        await self.__purge(now)
+        self.__remember(url, target, now)
+        await self.database.write_redirect_data(url, target, int(now))
+
+    async def __purge(self, now: float) -> None:
+        if now - self.__purged >= self.PURGE_INTERVAL:
+            self.__purged = now
+            await self.database.delete_redirect_data(int(now - self.ttl))
+
+    def __remember(self, url: str, target: str, time_: float) -> None:
+        self.__cache[url] = (target, time_)
+        self.__cache.move_to_end(url)
+        if len(self.__cache) > self.size:
+            self.__cache.popitem(last=False)
@@ -1,7 +1,5 @@
 from typing import TYPE_CHECKING
-from httpx import get
-from ..tools import capture_error_request, retry_request, wait
-from ..variable import TIMEOUT
+from ..tools import capture_error_request, retry_request
 
 if TYPE_CHECKING:
     from ..manager import Manager
@@ -9,10 +7,12 @@ if TYPE_CHECKING:
 
 class DetailPage:
     def __init__(self, manager: "Manager"):
-        self.client = manager.client
+        self.clients = manager.clients
+        self.breaker = manager.breaker
+        self.pacer = manager.pacer
         self.headers = manager.pc_headers
         self.console = manager.console
-        self.retry = manager.max_retry
+        self.retry_policy = manager.retry_policy
 
     async def run(self, url: str, proxy: str = "", cookie: str = "") -> str:
         return await self.request_url(url, proxy, cookie)
@@ -28,20 +28,12 @@ class DetailPage:
         headers = self.headers.copy()
         if cookie:
             headers["Cookie"] = cookie
-        if proxy:
-            response = get(
-                url,
-                headers=headers,
-                proxy=proxy,
-                follow_redirects=True,
-                verify=False,
-                timeout=TIMEOUT,
-            )
-        else:
-            response = await self.client.get(
-                url,
-                headers=headers,
-            )
-        await wait()
-        response.raise_for_status()
+        async with self.breaker.guard(url):
+            await self.pacer.wait(url)
+            async with self.clients.acquire(proxy) as client:
+                response = await client.get(
+                    url,
+                    headers=headers,
+                )
+            response.raise_for_status()
         return response.text
@@ -1,3 +1,4 @@
+from asyncio import Semaphore, gather
 from itertools import chain
 from re import compile
 from typing import TYPE_CHECKING, Any
@@ -6,12 +7,12 @@ from urllib.parse import (
     urlparse,
     urlunparse,
 )
-from httpx import get
-from ..tools import capture_error_request, retry_request, wait
-from ..variable import TIMEOUT
+from ..tools import capture_error_request, retry_request
+from .cache import RedirectCache
 
 if TYPE_CHECKING:
     from ..manager import Manager
+    from ..module import Database
 
 
 class Examiner:
@@ -22,16 +23,20 @@ class Examiner:
     PC_COMPLETE_URL = compile(r"(https?://\S*kuaishou\.(?:com|cn)/short-video/\S+)")
     C_COMPLETE_URL = compile(r"(https?://\S*kuaishou\.(?:com|cn)/fw/photo/\S+)")
     REDIRECT_URL = compile(r"(https?://\S*chenzhongtech\.(?:com|cn)/fw/photo/\S+)")
+    REDIRECT_WORKERS = 8
 
-    def __init__(self, manager: "Manager"):
-        self.client = manager.client
+    def __init__(self, manager: "Manager", database: "Database"):
+        self.clients = manager.clients
+        self.breaker = manager.breaker
+        self.cache = RedirectCache(database)
+        self.pacer = manager.pacer
         self.cookie = manager.cookie
         # self.app_headers = manager.app_headers
         # self.app_data_headers = manager.app_data_headers
         self.pc_headers = manager.pc_headers
         self.pc_data_headers = manager.pc_data_headers
         self.console = manager.console
-        self.retry = manager.max_retry
+        self.retry_policy = manager.retry_policy
 
     async def run(self, text: str, type_="detail", proxy: str = ""):
         urls = await self.__request_redirect(
@@ -67,18 +72,40 @@ class Examiner:
         text: str,
         proxy: str = "",
     ) -> str:
+        cache = False
         if not (urls := self.PC_COMPLETE_URL.findall(text)):
-            urls = self._convert_live(text) or self.SHORT_URL.findall(text)
-        result = []
-        for i in urls:
-            result.append(
-                await self.__request_url(
-                    i,
+            if not (urls := self._convert_live(text)):
+                urls = self.SHORT_URL.findall(text)
+                cache = True
+        semaphore = Semaphore(self.REDIRECT_WORKERS)
+
+        async def request(url: str) -> str:
+            # 尚未获取 Cookie 时需要实际请求短链接，以便从响应中获取 Cookie
+            if cache and self.cookie and (target := await self.cache.get(url)):
+                return target
+            async with semaphore:
+                target = await self.__request_url(
+                    url,
                     proxy,
                 )
-            )
+            if cache and self.__cacheable(target):
+                await self.cache.set(url, target)
+            return target
+
+        result = await gather(*(request(i) for i in urls))
         return " ".join(i for i in result if i)
 
+    def __cacheable(self, target: str) -> bool:
+        # 仅缓存作品链接，验证码、登录等页面不应缓存
+        return bool(target) and any(
+            i.match(target)
+            for i in (
+                self.REDIRECT_URL,
+                self.PC_COMPLETE_URL,
+                self.C_COMPLETE_URL,
+            )
+        )
+
     def _convert_live(self, text: str) -> list[str]:
         return [
             f"https://www.kuaishou.com/short-video/{i}"
@@ -92,22 +119,14 @@ class Examiner:
         url: str,
         proxy: str = "",
     ) -> str:
-        if proxy:
-            response = get(
-                url,
-                headers=self.pc_headers,
-                proxy=proxy,
-                follow_redirects=True,
-                verify=False,
-                timeout=TIMEOUT,
-            )
-        else:
-            response = await self.client.get(
-                url,
-                headers=self.pc_headers,
-            )
-        await wait()
-        response.raise_for_status()
+        async with self.breaker.guard(url):
+            await self.pacer.wait(url)
+            async with self.clients.acquire(proxy) as client:
+                response = await client.get(
+                    url,
+                    headers=self.pc_headers,
+                )
+            response.raise_for_status()
         self.__update_cookie(
             response.cookies.items(),
         )
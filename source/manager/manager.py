@@ -2,7 +2,16 @@ from re import compile, sub
 from shutil import rmtree, move
 from typing import TYPE_CHECKING
 
-from ..tools import base_client, remove_empty_directories
+from ..tools import (
+    Bandwidth,
+    CircuitBreaker,
+    ClientPool,
+    Pacer,
+    RetryPolicy,
+    base_client,
+    client_options,
+    remove_empty_directories,
+)
 from ..variable import (
     APP_DATA_HEADERS,
     APP_DOWNLOAD_HEADERS,
@@ -29,6 +38,9 @@ class Manager:
         mapping_data: dict,
         timeout: int,
         max_retry: int,
+        retry_backoff: dict,
+        circuit_breaker: dict,
+        pacing: dict,
         proxy: dict,
         work_path: "Path",
         folder_name: str,
@@ -42,7 +54,17 @@ class Manager:
         user_agent: str,
         folder_mode: bool,
         author_archive: bool,
+        dedup: bool,
         max_workers: int,
+        concurrency: dict,
+        bandwidth: dict,
+        segments: int,
+        sqlite_pragma: dict,
+        pipeline: dict,
+        parse_workers: int,
+        detail_cache: dict,
+        page_client: dict,
+        media_client: dict,
         *args,
         **kwargs,
     ):
@@ -55,11 +77,23 @@ class Manager:
         self.folder = self.path.joinpath(folder_name)
         self.compatible(folder_name)
         self.timeout = timeout
+        page_options = client_options(page_client, timeout)
         self.client = base_client(
             user_agent=user_agent,
-            timeout=timeout,
             proxy=proxy,
+            **page_options,
+        )
+        self.media_client = base_client(
+            user_agent=user_agent,
+            proxy=proxy,
+            **client_options(media_client, timeout),
+        )
+        self.clients = ClientPool(
+            self.client,
+            user_agent=user_agent,
+            **page_options,
         )
+        self.pacer = Pacer(**pacing)
         self.cookie = cookie
         self.pc_headers = PC_PAGE_HEADERS | {
             "Cookie": cookie,
@@ -82,15 +116,25 @@ class Manager:
         self.name_format = name_format
         self.name_length = name_length
         self.max_retry = max_retry
+        self.retry_policy = RetryPolicy(max_retry, **retry_backoff)
+        self.breaker = CircuitBreaker(console, **circuit_breaker)
         self.proxy = proxy
         self.cover = cover
         self.music = music
         self.data_record = data_record
         self.folder_mode = folder_mode
         self.author_archive = author_archive
+        self.dedup = dedup
         self.chunk = chunk
         self.mapping_data = mapping_data
         self.max_workers = max_workers
+        self.concurrency = concurrency
+        self.bandwidth = Bandwidth(**bandwidth)
+        self.segments = segments
+        self.sqlite_pragma = sqlite_pragma
+        self.pipeline = pipeline
+        self.parse_workers = parse_workers
+        self.detail_cache = detail_cache
         self.__create_folder()
 
     def __create_folder(self):
@@ -106,7 +150,9 @@ class Manager:
         return sub(r"_+", "_", name).strip("_")
 
     async def close(self):
+        await self.clients.close()
         await self.client.aclose()
+        await self.media_client.aclose()
         # self.__clear_temp()
         remove_empty_directories(self.root)
 
@@ -1,3 +1,4 @@
+from .error import CacheError, CircuitOpenError, RangeIgnoredError
 from .choose import choose
+from .connection import connect_database
 from .database import Database
-from .error import CacheError
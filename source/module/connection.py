@@ -0,0 +1,22 @@
+from pathlib import Path
+from sqlite3 import Row
+
+from aiosqlite import Connection, connect
+
+__all__ = ["connect_database"]
+
+
+async def connect_database(
+    file: Path,
+    pragma: dict,
+    readonly: bool = False,
+    row_factory: type[Row] | None = None,
+) -> Connection:
+    database = await connect(file)
+    for key, value in pragma.items():
+        await database.execute(f"PRAGMA {key}={value};")
+    if readonly:
+        await database.execute("PRAGMA query_only=ON;")
+    if row_factory:
+        database.row_factory = row_factory
+    return database
@@ -1,9 +1,12 @@
 from typing import TYPE_CHECKING
 from asyncio import CancelledError
 from contextlib import suppress
-from aiosqlite import Row, connect
+from aiosqlite import Row
 from shutil import move
 from ..static import PROJECT_ROOT
+from ..tools import BufferedWriter
+from ..translation import _
+from .connection import connect_database
 
 if TYPE_CHECKING:
     from ..manager import Manager
@@ -12,6 +15,11 @@ if TYPE_CHECKING:
 class Database:
     record = 1
     __FILE = "KS-Downloader.db"
+    __CHUNK = 500
+    # 下载记录先写入内存缓冲区，每累计 __FLUSH_ROWS 条或间隔 __FLUSH_INTERVAL 秒
+    # 批量提交一次；程序异常退出时最多丢失最后一个窗口的记录，对应作品会被重新下载
+    __FLUSH_ROWS = 256
+    __FLUSH_INTERVAL = 0.5
 
     def __init__(
         self,
@@ -19,18 +27,45 @@ class Database:
     ):
         self.file = PROJECT_ROOT.joinpath(self.__FILE)
         self.compatible()
+        self.console = manager.console
         self.switch = manager.author_archive
+        self.pragma = manager.sqlite_pragma
         self.database = None
-        self.cursor = None
+        self.reader = None
+        # ("data", ID): True 代表写入记录，False 代表删除记录
+        # ("file", 路径): (路径, 作品 ID, 文件大小, 文件哈希)
+        self.__buffer = BufferedWriter(
+            self.__write_buffer,
+            self.console,
+            _("写入下载记录失败，稍后重试: {error}"),
+            self.__FLUSH_ROWS,
+            self.__FLUSH_INTERVAL,
+        )
 
     async def __connect_database(self):
-        self.database = await connect(self.file)
-        self.database.row_factory = Row
-        self.cursor = await self.database.cursor()
+        self.database = await connect_database(
+            self.file,
+            self.pragma,
+            row_factory=Row,
+        )
         await self.__create_table()
         await self.__write_default_config()
         await self.__write_default_option()
         await self.database.commit()
+        self.reader = await connect_database(
+            self.file,
+            self.pragma,
+            readonly=True,
+            row_factory=Row,
+        )
+
+    async def __fetchall(self, sql: str, parameters=()) -> list:
+        async with self.reader.execute(sql, parameters) as cursor:
+            return await cursor.fetchall()
+
+    async def __fetchone(self, sql: str, parameters=()):
+        async with self.reader.execute(sql, parameters) as cursor:
+            return await cursor.fetchone()
 
     async def __create_table(self):
         await self.database.execute(
@@ -52,6 +87,27 @@ class Database:
             "NAME TEXT NOT NULL"
             ");"
         )
+        await self.database.execute(
+            "CREATE TABLE IF NOT EXISTS download_file ("
+            "PATH TEXT PRIMARY KEY,"
+            "ID TEXT NOT NULL,"
+            "SIZE INTEGER NOT NULL,"
+            "HASH TEXT NOT NULL"
+            ");"
+        )
+        await self.database.execute(
+            "CREATE INDEX IF NOT EXISTS download_file_id ON download_file (ID);"
+        )
+        await self.database.execute(
+            "CREATE INDEX IF NOT EXISTS download_file_hash ON download_file (HASH);"
+        )
+        await self.database.execute(
+            "CREATE TABLE IF NOT EXISTS redirect_data ("
+            "URL TEXT PRIMARY KEY,"
+            "TARGET TEXT NOT NULL,"
+            "TIME INTEGER NOT NULL"
+            ");"
+        )
 
     async def __write_default_config(self):
         await self.database.execute("""INSERT OR IGNORE INTO config_data (NAME, VALUE)
@@ -62,12 +118,10 @@ class Database:
                             VALUES ('Language', 'zh_CN');""")
 
     async def __read_config_data(self):
-        await self.cursor.execute("SELECT * FROM config_data")
-        return await self.cursor.fetchall()
+        return await self.__fetchall("SELECT * FROM config_data")
 
     async def __read_option_data(self):
-        await self.cursor.execute("SELECT * FROM option_data")
-        return await self.cursor.fetchall()
+        return await self.__fetchall("SELECT * FROM option_data")
 
     @staticmethod
     def __format_config(config: list) -> dict:
@@ -111,37 +165,122 @@ class Database:
     async def has_download_data(self, id_: str) -> bool:
         if not self.record:
             return False
-        await self.cursor.execute("SELECT ID FROM download_data WHERE ID=?", (id_,))
-        return bool(await self.cursor.fetchone())
+        if (buffered := self.__buffer.get(("data", id_))) is not None:
+            return buffered
+        return bool(
+            await self.__fetchone("SELECT ID FROM download_data WHERE ID=?", (id_,))
+        )
+
+    async def filter_downloaded(self, ids: list | tuple | set) -> set[str]:
+        if not self.record or not ids:
+            return set()
+        ids = list(dict.fromkeys(ids))
+        # 查询前获取缓冲区快照，避免查询期间提交完成的记录两处均未命中
+        buffered = self.__buffered()
+        result = set()
+        for i in range(0, len(ids), self.__CHUNK):
+            chunk = ids[i : i + self.__CHUNK]
+            result.update(
+                row["ID"]
+                for row in await self.__fetchall(
+                    f"SELECT ID FROM download_data WHERE ID IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+            )
+        for i in ids:
+            if (j := buffered.get(i)) is not None:
+                if j:
+                    result.add(i)
+                else:
+                    result.discard(i)
+        return result
+
+    def __buffered(self) -> dict[str, bool]:
+        return {j: k for (i, j), k in self.__buffer.items() if i == "data"}
 
     async def write_download_data(self, id_: str):
         if self.record:
-            await self.database.execute(
-                "INSERT OR IGNORE INTO download_data (ID) VALUES (?);", (id_,)
-            )
-            await self.database.commit()
+            self.__buffer_download_data(id_, True)
 
     async def delete_download_data(self, ids: list | tuple | str):
         if not self.record:
             return
         if isinstance(ids, str):
             ids = [ids]
-        [await self.__delete_download_data(i) for i in ids]
-        await self.database.commit()
+        for i in ids:
+            self.__buffer_download_data(i, False)
+
+    def __buffer_download_data(self, id_: str, write: bool) -> None:
+        self.__buffer.put(("data", id_), write)
+
+    async def write_file_data(
+        self,
+        path: str,
+        id_: str,
+        size: int,
+        hash_: str,
+    ) -> None:
+        self.__buffer.put(("file", path), (path, id_, size, hash_))
 
-    async def __delete_download_data(self, id_: str):
-        await self.database.execute("DELETE FROM download_data WHERE ID=?", (id_,))
+    async def read_file_data(self, id_: str) -> list:
+        await self.flush_download_data()
+        return await self.__fetchall(
+            "SELECT PATH, SIZE, HASH FROM download_file WHERE ID=?", (id_,)
+        )
+
+    async def find_file_data(self, hash_: str, size: int) -> list[str]:
+        # 先查找尚未提交的记录，与数据库中的记录合并去重
+        paths = [
+            j[0]
+            for i, j in self.__buffer.items()
+            if i[0] == "file" and j[3] == hash_ and j[2] == size
+        ]
+        paths.extend(
+            row["PATH"]
+            for row in await self.__fetchall(
+                "SELECT PATH FROM download_file WHERE HASH=? AND SIZE=?",
+                (hash_, size),
+            )
+        )
+        return list(dict.fromkeys(paths))
+
+    async def flush_download_data(self):
+        await self.__buffer.flush()
+
+    async def __write_buffer(self, batch: dict) -> None:
+        files, insert, delete = [], [], []
+        for (kind, key), value in batch.items():
+            if kind == "file":
+                files.append(value)
+            elif value:
+                insert.append((key,))
+            else:
+                delete.append((key,))
+        if files:
+            await self.database.executemany(
+                "REPLACE INTO download_file (PATH, ID, SIZE, HASH) VALUES (?, ?, ?, ?);",
+                files,
+            )
+        if insert:
+            await self.database.executemany(
+                "INSERT OR IGNORE INTO download_data (ID) VALUES (?);", insert
+            )
+        if delete:
+            await self.database.executemany(
+                "DELETE FROM download_data WHERE ID=?", delete
+            )
+        await self.database.commit()
 
     async def delete_all_download_data(self):
+        self.__buffer.discard(lambda key: key[0] == "data")
         await self.database.execute("DELETE FROM download_data")
         await self.database.commit()
 
     async def get_mapping_data(self, id_: str):
         if self.switch:
-            await self.cursor.execute(
+            return await self.__fetchone(
                 "SELECT NAME FROM mapping_data WHERE ID=?", (id_,)
             )
-            return await self.cursor.fetchone()
 
     async def update_mapping_data(
         self,
@@ -158,14 +297,46 @@ class Database:
             )
             await self.database.commit()
 
+    async def read_redirect_data(self, url: str):
+        return await self.__fetchone(
+            "SELECT TARGET, TIME FROM redirect_data WHERE URL=?", (url,)
+        )
+
+    async def write_redirect_data(
+        self,
+        url: str,
+        target: str,
+        time: int,
+    ) -> None:
+        await self.database.execute(
+            "REPLACE INTO redirect_data (URL, TARGET, TIME) VALUES (?, ?, ?);",
+            (
+                url,
+                target,
+                time,
+            ),
+        )
+        await self.database.commit()
+
+    async def delete_redirect_data(self, before: int) -> None:
+        await self.database.execute(
+            "DELETE FROM redirect_data WHERE TIME<?;",
+            (before,),
+        )
+        await self.database.commit()
+
     async def __aenter__(self):
         await self.__connect_database()
+        self.__buffer.start()
         return self
 
     async def close(self):
-        with suppress(CancelledError):
-            await self.cursor.close()
-        await self.database.close()
+        try:
+            await self.__buffer.close()
+        finally:
+            with suppress(CancelledError):
+                await self.reader.close()
+            await self.database.close()
 
     async def __aexit__(self, exc_type, exc_value, traceback):
         await self.close()
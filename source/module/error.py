@@ -5,3 +5,16 @@ class CacheError(Exception):
 
     def __str__(self):
         return self.message
+
+
+class RangeIgnoredError(CacheError):
+    pass
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+    def __str__(self):
+        return self.message
@@ -1,13 +1,20 @@
 from typing import TYPE_CHECKING
 from asyncio import CancelledError
 from contextlib import suppress
-from aiosqlite import connect
+from itertools import count
+from ..module import connect_database
+from ..tools import BufferedWriter
+from ..translation import _
 
 if TYPE_CHECKING:
     from source.manager import Manager
 
 
 class SQLite:
+    # 作品数据每累计 __BATCH 条或间隔 __INTERVAL 秒批量写入一次
+    __BATCH = 128
+    __INTERVAL = 1
+
     def __init__(
         self,
         manager: "Manager",
@@ -19,14 +26,33 @@ class SQLite:
     ):
         self.db_name = db_name
         self.file = manager.data.joinpath(filename)
+        self.console = manager.console
+        self.pragma = manager.sqlite_pragma
         self.database = None
         self.cursor = None
         self.key = key
         self.name = name
         self.type_ = type_
+        self.__sql = f"""REPLACE INTO {self.db_name} (
+                {", ".join(self.name)}
+                ) VALUES (
+                {", ".join("?" for _ in self.key)}
+                );"""
+        # 以递增序号为键，保持作品数据的写入顺序
+        self.__index = count()
+        self.__buffer = BufferedWriter(
+            self.__write_buffer,
+            self.console,
+            _("写入作品数据失败，稍后重试: {error}"),
+            self.__BATCH,
+            self.__INTERVAL,
+        )
 
     async def _connect_database(self):
-        self.database = await connect(self.file)
+        self.database = await connect_database(
+            self.file,
+            self.pragma,
+        )
         self.cursor = await self.database.cursor()
         await self.database.execute(f"""CREATE TABLE IF NOT EXISTS {self.db_name} (
                 {",".join(f"{i} {j}" for i, j in zip(self.name, self.type_))}
@@ -34,14 +60,13 @@ class SQLite:
         await self.database.commit()
 
     async def update(self, data: dict) -> None:
-        await self.database.execute(
-            f"""REPLACE INTO {self.db_name} (
-                {", ".join(self.name)}
-                ) VALUES (
-                {", ".join("?" for _ in data)}
-                );""",
-            self.__generate_values(data),
-        )
+        self.__buffer.put(next(self.__index), self.__generate_values(data))
+
+    async def flush(self) -> None:
+        await self.__buffer.flush()
+
+    async def __write_buffer(self, batch: dict) -> None:
+        await self.database.executemany(self.__sql, batch.values())
         await self.database.commit()
 
     def __generate_values(self, data: dict) -> tuple:
@@ -49,9 +74,13 @@ class SQLite:
 
     async def __aenter__(self):
         await self._connect_database()
+        self.__buffer.start()
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback):
-        with suppress(CancelledError):
-            await self.cursor.close()
-        await self.database.close()
+        try:
+            await self.__buffer.close()
+        finally:
+            with suppress(CancelledError):
+                await self.cursor.close()
+            await self.database.close()
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from ..tools import capture_error_request, retry_request, wait
+from ..tools import capture_error_request, retry_request
 from ..translation import _
 
 if TYPE_CHECKING:
@@ -19,7 +19,9 @@ class API:
         self.client = manager.client
         self.headers = manager.pc_data_headers
         self.console = manager.console
-        self.retry = manager.max_retry
+        self.retry_policy = manager.retry_policy
+        self.breaker = manager.breaker
+        self.pacer = manager.pacer
         self.note: str = ""
         self.extract_keys: tuple[str, ...] = ()
         self.finished = False
@@ -94,16 +96,17 @@ class API:
         json: dict = None,
         **kwargs,
     ):
-        response = await self.client.post(
-            url,
-            headers=headers or self.headers,
-            params=params,
-            data=data,
-            json=json,
-            **kwargs,
-        )
-        await wait()
-        response.raise_for_status()
+        async with self.breaker.guard(url):
+            await self.pacer.wait(url)
+            response = await self.client.post(
+                url,
+                headers=headers or self.headers,
+                params=params,
+                data=data,
+                json=json,
+                **kwargs,
+            )
+            response.raise_for_status()
         return response.json()
 
     @retry_request
@@ -115,14 +118,15 @@ class API:
         headers: dict = None,
         **kwargs,
     ):
-        response = await self.client.get(
-            url,
-            headers=headers or self.headers,
-            params=params,
-            **kwargs,
-        )
-        await wait()
-        response.raise_for_status()
+        async with self.breaker.guard(url):
+            await self.pacer.wait(url)
+            response = await self.client.get(
+                url,
+                headers=headers or self.headers,
+                params=params,
+                **kwargs,
+            )
+            response.raise_for_status()
         return response.json()
 
     def generate_params(
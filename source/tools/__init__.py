@@ -1,7 +1,10 @@
 from .browser import BrowserCookie
+from .breaker import CircuitBreaker
+from .bucket import Bandwidth, TokenBucket
+from .cache import TTLCache
 from .capture import capture_error_request
 from .cleaner import Cleaner
-from .client import base_client
+from .client import ClientPool, base_client, client_options
 from .console import (
     ColorConsole,
     MASTER,
@@ -12,13 +15,16 @@ from .console import (
     WARNING,
     INFO,
 )
-from .namespace import Namespace
+from .namespace import Namespace, DataView, ListView
+from .pipeline import Pipeline
 from .remove import remove_empty_directories
-from .retry import retry_request
+from .retry import Failure, RetryPolicy, retry_request
 from .truncate import beautify_string
 from .truncate import trim_string
 from .truncate import truncate_string
 from .version import Version
 from .mapping import Mapping
-from .sleep import wait
+from .limiter import AdaptiveLimiter
+from .sleep import Pacer
 from .progress import FakeProgress
+from .writer import BufferedWriter
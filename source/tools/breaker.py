@@ -0,0 +1,193 @@
+from collections import deque
+from math import ceil
+from contextlib import asynccontextmanager
+from time import monotonic
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+from httpx import HTTPStatusError, NetworkError, RemoteProtocolError, TimeoutException
+
+from ..module import CircuitOpenError
+from ..translation import _
+
+if TYPE_CHECKING:
+    from .console import ColorConsole
+
+__all__ = ["CircuitBreaker"]
+
+
+class Circuit:
+    __slots__ = ("state", "events", "failures", "opened", "probing", "rejected")
+
+    def __init__(self):
+        self.state = CircuitBreaker.CLOSED
+        # 窗口内的请求结果，元素为 (时间, 是否失败)
+        self.events: deque[tuple[float, bool]] = deque()
+        self.failures = 0
+        self.opened = 0.0
+        self.probing = 0
+        self.rejected = 0
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker shared by all requests.
+
+    A host's circuit opens when at least ``threshold`` of the requests in the
+    last ``window`` seconds failed, given at least ``minimum`` requests. While
+    open, requests to the host fail fast with ``CircuitOpenError``. After
+    ``cooldown`` seconds up to ``probes`` requests are let through; one success
+    closes the circuit and one failure opens it again.
+
+    Throttling responses (403, 429, 5xx), timeouts and network errors count as
+    failures; other responses count as successes.
+
+    Args:
+        console: Console used to report state changes.
+        threshold: Failure ratio that opens a circuit; 0 disables the breaker.
+        minimum: Requests needed in the window before a circuit can open.
+        window: Length of the sliding window in seconds.
+        cooldown: Seconds a circuit stays open before probing.
+        probes: Concurrent probe requests while half-open.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(
+        self,
+        console: "ColorConsole",
+        threshold: float = 0.5,
+        minimum: int = 10,
+        window: int = 60,
+        cooldown: int = 30,
+        probes: int = 1,
+    ):
+        self.console = console
+        self.threshold = threshold
+        self.minimum = minimum
+        self.window = window
+        self.cooldown = cooldown
+        self.probes = probes
+        self.__circuits: dict[str, Circuit] = {}
+
+    @asynccontextmanager
+    async def guard(self, url: str):
+        if not self.threshold:
+            yield
+            return
+        host = urlparse(url).hostname or ""
+        circuit = self.__circuits.setdefault(host, Circuit())
+        probe = self.__admit(host, circuit)
+        try:
+            yield
+        except Exception as e:
+            self.__record(host, circuit, self.__failed(e), probe)
+            raise
+        else:
+            self.__record(host, circuit, False, probe)
+        finally:
+            # 请求被取消时不记录结果，但仍需释放探测名额
+            if probe:
+                circuit.probing -= 1
+
+    def snapshot(self) -> dict[str, dict]:
+        self.__expire_all()
+        return {
+            host: {
+                "state": i.state,
+                "probing": i.probing,
+                "requests": len(i.events),
+                "failures": i.failures,
+                "rejected": i.rejected,
+            }
+            for host, i in self.__circuits.items()
+        }
+
+    def __admit(self, host: str, circuit: Circuit) -> bool:
+        if circuit.state == self.OPEN:
+            if (remaining := self.cooldown - monotonic() + circuit.opened) > 0:
+                self.__reject(host, circuit, remaining)
+            circuit.state = self.HALF_OPEN
+            self.console.info(_("{host} 暂停结束，尝试恢复请求").format(host=host))
+        if circuit.state == self.HALF_OPEN:
+            if circuit.probing >= self.probes:
+                circuit.rejected += 1
+                raise CircuitOpenError(
+                    _("{host} 正在尝试恢复请求，请稍后重试").format(host=host)
+                )
+            circuit.probing += 1
+            return True
+        return False
+
+    def __reject(self, host: str, circuit: Circuit, remaining: float) -> None:
+        circuit.rejected += 1
+        raise CircuitOpenError(
+            _("{host} 请求已暂停，{seconds} 秒后恢复").format(
+                host=host,
+                seconds=ceil(remaining),
+            )
+        )
+
+    def __record(
+        self,
+        host: str,
+        circuit: Circuit,
+        failed: bool | None,
+        probe: bool,
+    ) -> None:
+        if failed is None:
+            return
+        now = monotonic()
+        if circuit.state == self.HALF_OPEN:
+            if not probe:
+                return
+            if failed:
+                self.__open(host, circuit, now)
+            else:
+                circuit.state = self.CLOSED
+                circuit.events.clear()
+                circuit.failures = 0
+                self.console.info(_("{host} 已恢复请求").format(host=host))
+            return
+        if circuit.state == self.OPEN:
+            return
+        circuit.events.append((now, failed))
+        circuit.failures += failed
+        self.__expire(circuit, now)
+        if len(
+            circuit.events
+        ) >= self.minimum and circuit.failures >= self.threshold * len(circuit.events):
+            self.__open(host, circuit, now)
+
+    def __open(self, host: str, circuit: Circuit, now: float) -> None:
+        circuit.state = self.OPEN
+        circuit.opened = now
+        circuit.events.clear()
+        circuit.failures = 0
+        self.console.warning(
+            _("{host} 请求失败率过高，暂停请求 {seconds} 秒").format(
+                host=host,
+                seconds=self.cooldown,
+            )
+        )
+
+    def __expire(self, circuit: Circuit, now: float) -> None:
+        while circuit.events and now - circuit.events[0][0] > self.window:
+            circuit.failures -= circuit.events.popleft()[1]
+
+    def __expire_all(self) -> None:
+        now = monotonic()
+        for i in self.__circuits.values():
+            self.__expire(i, now)
+
+    @staticmethod
+    def __failed(error: BaseException) -> bool | None:
+        while error is not None:
+            if isinstance(error, HTTPStatusError):
+                status = error.response.status_code
+                return status in (403, 429) or status >= 500
+            if isinstance(error, (TimeoutException, NetworkError, RemoteProtocolError)):
+                return True
+            error = error.__cause__
+        return None
@@ -0,0 +1,86 @@
+from asyncio import sleep
+from time import monotonic
+
+__all__ = ["TokenBucket", "Bandwidth"]
+
+
+class TokenBucket:
+    """Token bucket measured in bytes.
+
+    Consumers take tokens first and then sleep off any deficit, so chunks
+    larger than the bucket are allowed, and concurrent consumers share the
+    rate fairly.
+
+    Args:
+        rate: Bytes per second; 0 disables the bucket.
+        burst: Bucket size in bytes; defaults to one second of ``rate``.
+    """
+
+    def __init__(self, rate: int = 0, burst: int = 0):
+        self.set_rate(rate, burst)
+
+    def set_rate(self, rate: int, burst: int = 0) -> None:
+        self.rate = rate
+        self.burst = burst or rate
+        self.__tokens = self.burst
+        self.__time = monotonic()
+
+    async def consume(self, size: int) -> None:
+        if not self.rate:
+            return
+        now = monotonic()
+        self.__tokens = min(
+            self.burst,
+            self.__tokens + (now - self.__time) * self.rate,
+        )
+        self.__time = now
+        self.__tokens -= size
+        if self.__tokens < 0:
+            await sleep(-self.__tokens / self.rate)
+
+
+class Bandwidth:
+    """Download bandwidth limits: one global bucket plus optional per-host buckets.
+
+    A host limit applies to the host and its subdomains. Limits can be changed
+    while downloads are running with ``set_rate``.
+
+    Args:
+        rate: Global limit in bytes per second; 0 means unlimited.
+        hosts: Per-host limits in bytes per second.
+    """
+
+    def __init__(self, rate: int = 0, hosts: dict[str, int] = None):
+        self.total = TokenBucket(rate)
+        self.hosts = {k: TokenBucket(v) for k, v in (hosts or {}).items()}
+        self.__resolved: dict[str, TokenBucket | None] = {}
+        self.enabled = False
+        self.__update()
+
+    def set_rate(self, rate: int, host: str = "") -> None:
+        if not host:
+            self.total.set_rate(rate)
+        elif bucket := self.hosts.get(host):
+            bucket.set_rate(rate)
+        else:
+            self.hosts[host] = TokenBucket(rate)
+            self.__resolved.clear()
+        self.__update()
+
+    async def consume(self, host: str, size: int) -> None:
+        await self.total.consume(size)
+        if bucket := self.__bucket(host):
+            await bucket.consume(size)
+
+    def __bucket(self, host: str) -> TokenBucket | None:
+        try:
+            return self.__resolved[host]
+        except KeyError:
+            pass
+        names = [i for i in self.hosts if host == i or host.endswith(f".{i}")]
+        bucket = self.hosts[max(names, key=len)] if names else None
+        self.__resolved[host] = bucket
+        return bucket
+
+    def __update(self) -> None:
+        self.enabled = bool(self.total.rate) or any(i.rate for i in self.hosts.values())
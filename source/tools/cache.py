@@ -0,0 +1,66 @@
+from asyncio import Task, ensure_future, shield
+from collections import OrderedDict
+from copy import deepcopy
+from time import monotonic
+from typing import Any, Awaitable, Callable
+
+__all__ = ["TTLCache"]
+
+
+class TTLCache:
+    """LRU cache with expiry that coalesces concurrent loads of the same key.
+
+    Only dict results are cached; any other result (such as an error message)
+    is handed to the callers waiting on that load and then dropped. Every caller
+    receives its own deep copy, so the cached value can't be modified. Loads run
+    in their own task, so a cancelled caller doesn't cancel the others.
+
+    Args:
+        size: Maximum number of cached entries.
+        ttl: Lifetime of an entry in seconds; 0 disables caching, but
+            concurrent loads are still coalesced.
+    """
+
+    def __init__(
+        self,
+        size: int = 256,
+        ttl: int = 60,
+    ):
+        self.size = size
+        self.ttl = ttl
+        self.__cache: OrderedDict[str, tuple[dict, float]] = OrderedDict()
+        self.__loading: dict[str, Task] = {}
+
+    async def get(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        if item := self.__cache.get(key):
+            if monotonic() - item[1] < self.ttl:
+                self.__cache.move_to_end(key)
+                return deepcopy(item[0])
+            del self.__cache[key]
+        if not (task := self.__loading.get(key)):
+            self.__loading[key] = task = ensure_future(loader())
+            task.add_done_callback(lambda x: self.__loaded(key, x))
+        return deepcopy(await shield(task))
+
+    def __loaded(self, key: str, task: Task) -> None:
+        del self.__loading[key]
+        # 所有调用方均已取消时避免未获取异常的警告
+        if task.cancelled() or task.exception():
+            return
+        if isinstance(result := task.result(), dict):
+            self.__store(key, result)
+
+    def __store(self, key: str, value: dict) -> None:
+        if not (self.ttl and self.size):
+            return
+        self.__cache[key] = (deepcopy(value), monotonic())
+        self.__cache.move_to_end(key)
+        while len(self.__cache) > self.size:
+            self.__cache.popitem(last=False)
+
+    def clear(self) -> None:
+        self.__cache.clear()
@@ -2,8 +2,9 @@ from json.decoder import JSONDecodeError
 
 from httpx import HTTPError
 
-from ..module import CacheError
+from ..module import CacheError, CircuitOpenError
 from ..translation import _
+from .retry import Failure
 
 
 def capture_error_request(function):
@@ -12,12 +13,18 @@ def capture_error_request(function):
             return await function(self, *args, **kwargs)
         except HTTPError as e:
             self.console.error(_("网络异常：{error}").format(error=repr(e)))
+            return Failure(e)
         except JSONDecodeError as e:
             self.console.error(_("响应内容异常：{error}").format(error=repr(e)))
+            return Failure(e)
         except PermissionError as e:
             self.console.error(_("权限异常：{error}").format(error=repr(e)))
+            return Failure(e)
         except CacheError as e:
             self.console.error(e)
-        return None
+            return Failure(e)
+        except CircuitOpenError as e:
+            self.console.warning(e)
+            return Failure(e)
 
     return inner
@@ -1,4 +1,9 @@
-from httpx import AsyncClient, AsyncHTTPTransport, Limits
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from time import monotonic
+from typing import AsyncIterator
+
+from httpx import AsyncClient, AsyncHTTPTransport, Limits, Timeout
 
 from source.variable import PC_USERAGENT, TIMEOUT
 
@@ -7,19 +12,122 @@ def base_client(
     user_agent=PC_USERAGENT,
     timeout=TIMEOUT,
     proxy=None,
+    limits: Limits = None,
+    http2: bool = False,
     **kwargs,
 ) -> AsyncClient:
+    limits = limits or Limits(max_connections=10)
+    # 挂载的传输层不会继承客户端的连接池设置
     return AsyncClient(
         headers={
             "User-Agent": user_agent,
         },
         timeout=timeout,
         verify=False,
-        limits=Limits(max_connections=10),
+        limits=limits,
+        http2=http2,
         follow_redirects=True,
         mounts={
-            "http://": AsyncHTTPTransport(proxy=proxy),
-            "https://": AsyncHTTPTransport(proxy=proxy),
+            "http://": AsyncHTTPTransport(
+                proxy=proxy,
+                limits=limits,
+                http2=http2,
+            ),
+            "https://": AsyncHTTPTransport(
+                proxy=proxy,
+                limits=limits,
+                http2=http2,
+            ),
         },
         **kwargs,
     )
+
+
+def client_options(settings: dict, timeout: int) -> dict:
+    return {
+        "timeout": Timeout(
+            timeout,
+            connect=settings["connect_timeout"],
+            read=settings["read_timeout"],
+            pool=settings["pool_timeout"],
+        ),
+        "limits": Limits(
+            max_connections=settings["max_connections"],
+            max_keepalive_connections=settings["max_keepalive_connections"],
+            keepalive_expiry=settings["keepalive_expiry"],
+        ),
+        "http2": settings["http2"],
+    }
+
+
+class ClientPool:
+    """Reuses one AsyncClient per proxy URL.
+
+    Clients are created on first use. Clients that are not in use are closed
+    once they have been idle for ``idle`` seconds, or least recently used first
+    when the pool holds ``size`` clients.
+
+    Args:
+        client: Client used for requests without a proxy; not owned by the pool.
+        size: Maximum number of idle proxy clients kept open.
+        idle: Seconds an unused proxy client is kept open.
+        **kwargs: Passed to ``base_client`` for new proxy clients.
+    """
+
+    SIZE = 8
+    IDLE = 300
+
+    def __init__(
+        self,
+        client: AsyncClient,
+        size: int = SIZE,
+        idle: int = IDLE,
+        **kwargs,
+    ):
+        self.default = client
+        self.size = size
+        self.idle = idle
+        self.kwargs = kwargs
+        self.__clients: OrderedDict[str, AsyncClient] = OrderedDict()
+        self.__users: dict[str, int] = {}
+        self.__used: dict[str, float] = {}
+
+    @asynccontextmanager
+    async def acquire(self, proxy: str = "") -> AsyncIterator[AsyncClient]:
+        if not proxy:
+            yield self.default
+            return
+        await self.__evict(proxy)
+        if not (client := self.__clients.get(proxy)):
+            client = self.__clients[proxy] = base_client(
+                proxy=proxy,
+                **self.kwargs,
+            )
+        self.__clients.move_to_end(proxy)
+        self.__users[proxy] = self.__users.get(proxy, 0) + 1
+        try:
+            yield client
+        finally:
+            self.__users[proxy] -= 1
+            self.__used[proxy] = monotonic()
+
+    async def __evict(self, keep: str) -> None:
+        now = monotonic()
+        for proxy in list(self.__clients):
+            if proxy == keep or self.__users.get(proxy):
+                continue
+            if (
+                len(self.__clients) >= self.size
+                or now - self.__used.get(proxy, now) > self.idle
+            ):
+                await self.__close(proxy)
+
+    async def __close(self, proxy: str) -> None:
+        client = self.__clients.pop(proxy)
+        self.__users.pop(proxy, None)
+        self.__used.pop(proxy, None)
+        await client.aclose()
+
+    async def close(self) -> None:
+        for proxy in list(self.__clients):
+            await self.__close(proxy)
@@ -0,0 +1,107 @@
+from asyncio import CancelledError, Future, get_running_loop
+from collections import deque
+from time import monotonic
+
+__all__ = ["AdaptiveLimiter"]
+
+
+class AdaptiveLimiter:
+    """Concurrency limit that adapts to throughput (AIMD).
+
+    Throughput is measured over windows of ``window`` seconds from the byte
+    counts passed to ``feed``. While every slot is in use, the limit grows by
+    one when throughput improves, and halves when throughput collapses or
+    when ``penalize`` reports throttling. Cuts closer together than one
+    window count as one.
+
+    Args:
+        floor: Lowest limit.
+        ceiling: Highest limit.
+        initial: Starting limit, clamped to ``floor`` and ``ceiling``.
+        window: Length of a measuring window in seconds.
+    """
+
+    GAIN = 1.05
+    COLLAPSE = 0.5
+    BACKOFF = 0.5
+
+    def __init__(
+        self,
+        floor: int,
+        ceiling: int,
+        initial: int = 0,
+        window: float = 2,
+    ):
+        self.floor = floor
+        self.ceiling = ceiling
+        self.limit = min(max(initial, floor), ceiling)
+        self.active = 0
+        self.window = window
+        self.__waiters: deque[Future] = deque()
+        self.__bytes = 0
+        self.__start = monotonic()
+        self.__rate = 0.0
+        self.__cut = 0.0
+
+    async def acquire(self) -> None:
+        while self.active >= self.limit:
+            future = get_running_loop().create_future()
+            self.__waiters.append(future)
+            try:
+                await future
+            except CancelledError:
+                if future in self.__waiters:
+                    self.__waiters.remove(future)
+                self.__wake()
+                raise
+        self.active += 1
+
+    def release(self) -> None:
+        self.active -= 1
+        self.__wake()
+
+    def feed(self, size: int) -> None:
+        self.__bytes += size
+        now = monotonic()
+        if (elapsed := now - self.__start) < self.window:
+            return
+        rate = self.__bytes / elapsed
+        self.__bytes = 0
+        self.__start = now
+        # 并发未用满时吞吐量受任务数量限制，不作调整
+        if self.active >= self.limit and self.__rate:
+            if rate < self.__rate * self.COLLAPSE:
+                self.__decrease(now)
+                return
+            if rate >= self.__rate * self.GAIN:
+                self.__increase()
+        self.__rate = rate
+
+    def penalize(self) -> None:
+        self.__decrease(monotonic())
+
+    def __increase(self) -> None:
+        if self.limit < self.ceiling:
+            self.limit += 1
+            self.__wake()
+
+    def __decrease(self, now: float) -> None:
+        if now - self.__cut < self.window:
+            return
+        self.__cut = now
+        self.__rate = 0.0
+        self.limit = max(self.floor, int(self.limit * self.BACKOFF))
+
+    def __wake(self) -> None:
+        free = self.limit - self.active
+        while free > 0 and self.__waiters:
+            if not (future := self.__waiters.popleft()).done():
+                future.set_result(None)
+                free -= 1
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.release()
@@ -1,52 +1,129 @@
+from collections.abc import Sequence
 from copy import deepcopy
+from functools import lru_cache
 from types import SimpleNamespace
-from typing import Union
+from typing import Any, Union
 
-__all__ = ["Namespace"]
+__all__ = ["Namespace", "Accessor", "DataView", "ListView"]
 
 
-class Namespace:
+def wrap(value: Any) -> Any:
+    if isinstance(value, dict):
+        return DataView(value)
+    if isinstance(value, list):
+        return ListView(value)
+    return value
+
+
+class DataView:
+    """Read-only attribute view of a parsed dict; nested values are wrapped on access."""
+
+    __slots__ = ("__data",)
+
     def __init__(self, data: dict) -> None:
-        self.data: SimpleNamespace = self.generate_data_object(data)
+        object.__setattr__(self, "_DataView__data", data)
 
-    @staticmethod
-    def generate_data_object(data: dict) -> SimpleNamespace:
-        def depth_conversion(element):
-            if isinstance(element, dict):
-                return SimpleNamespace(
-                    **{k: depth_conversion(v) for k, v in element.items()}
-                )
-            elif isinstance(element, list):
-                return [depth_conversion(item) for item in element]
-            else:
-                return element
+    def __getattr__(self, name: str) -> Any:
+        # 内部属性与特殊方法不从数据中查找，避免复制、序列化时无限递归
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return wrap(self.__data[name])
+        except KeyError:
+            raise AttributeError(name) from None
 
-        return depth_conversion(data)
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
 
-    def safe_extract(
-        self,
-        attribute_chain: str,
-        default: Union[str, int, list, dict, SimpleNamespace] = "",
-    ):
-        return self.__safe_extract(self.data, attribute_chain, default)
+    @property
+    def __dict__(self) -> dict:
+        return self.__data
+
+    def __dir__(self) -> list[str]:
+        return list(self.__data)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, DataView):
+            return self.__data == vars(other)
+        return NotImplemented
+
+    def __reduce__(self):
+        return type(self), (self.__data,)
+
+    def __copy__(self) -> "DataView":
+        return type(self)(self.__data)
+
+    def __deepcopy__(self, memo: dict) -> "DataView":
+        return type(self)(deepcopy(self.__data, memo))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.__data!r})"
+
+
+class ListView(Sequence):
+    """Read-only view of a parsed list; items are wrapped on access."""
+
+    __slots__ = ("__data",)
+
+    def __init__(self, data: list) -> None:
+        self.__data = data
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return ListView(self.__data[index])
+        return wrap(self.__data[index])
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ListView | list):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __reduce__(self):
+        return type(self), (self.__data,)
+
+    def __copy__(self) -> "ListView":
+        return type(self)(self.__data)
+
+    def __deepcopy__(self, memo: dict) -> "ListView":
+        return type(self)(deepcopy(self.__data, memo))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.__data!r})"
+
+
+class Accessor:
+    """Pre-parsed attribute chain such as ``a.b[0].c``, evaluated read-only."""
+
+    __slots__ = ("chain", "steps")
+
+    def __init__(self, attribute_chain: str) -> None:
+        self.chain = attribute_chain
+        self.steps = tuple(self.__parse(i) for i in attribute_chain.split("."))
 
     @staticmethod
-    def __safe_extract(
-        data_object: SimpleNamespace,
-        attribute_chain: str,
-        default: Union[str, int, list, dict, SimpleNamespace] = "",
+    def __parse(attribute: str) -> tuple[str, bool, int | None]:
+        if "[" not in attribute:
+            return attribute, False, None
+        attribute, index = attribute.split("[", 1)
+        try:
+            return attribute, True, int(index.split("]", 1)[0])
+        except ValueError:
+            return attribute, True, None
+
+    def __call__(
+        self,
+        data_object,
+        default: Union[str, int, list, dict, DataView] = "",
     ):
-        data = deepcopy(data_object)
-        attributes = attribute_chain.split(".")
-        for attribute in attributes:
-            if "[" in attribute:
-                parts = attribute.split("[", 1)
-                attribute = parts[0]
-                index = parts[1][:-1]
+        data = data_object
+        for attribute, indexed, index in self.steps:
+            if indexed:
                 try:
-                    index = int(index)
                     data = getattr(data, attribute, None)[index]
-                except (IndexError, TypeError, ValueError):
+                except (IndexError, TypeError):
                     return default
             else:
                 data = getattr(data, attribute, None)
@@ -54,18 +131,38 @@ class Namespace:
                     return default
         return data or default
 
+    def __repr__(self) -> str:
+        return f"Accessor({self.chain!r})"
+
+
+class Namespace:
+    def __init__(self, data: dict) -> None:
+        self.data: DataView = self.generate_data_object(data)
+
+    @staticmethod
+    def generate_data_object(data: dict | list) -> DataView | ListView:
+        return wrap(data)
+
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def compile(attribute_chain: str) -> Accessor:
+        return Accessor(attribute_chain)
+
+    def safe_extract(
+        self,
+        attribute_chain: str,
+        default: Union[str, int, list, dict, DataView] = "",
+    ):
+        return self.compile(attribute_chain)(self.data, default)
+
     @classmethod
     def object_extract(
         cls,
-        data_object: SimpleNamespace,
+        data_object: DataView,
         attribute_chain: str,
-        default: Union[str, int, list, dict, SimpleNamespace] = "",
+        default: Union[str, int, list, dict, DataView] = "",
     ):
-        return cls.__safe_extract(
-            data_object,
-            attribute_chain,
-            default,
-        )
+        return cls.compile(attribute_chain)(data_object, default)
 
     @property
     def __dict__(self):
@@ -75,7 +172,7 @@ class Namespace:
     def convert_to_dict(cls, data) -> dict:
         return {
             key: cls.convert_to_dict(value)
-            if isinstance(value, SimpleNamespace)
+            if isinstance(value, SimpleNamespace | DataView)
             else value
             for key, value in vars(data).items()
         }
@@ -0,0 +1,90 @@
+from asyncio import (
+    FIRST_COMPLETED,
+    CancelledError,
+    Queue,
+    create_task,
+    current_task,
+    gather,
+    wait,
+)
+from typing import Any, Awaitable, Callable
+
+__all__ = ["Pipeline"]
+
+
+class Pipeline:
+    def __init__(
+        self,
+        *stages: tuple[Callable[[Any], Awaitable[Any]], int],
+        queue_size: int = 16,
+    ):
+        self.stages = stages
+        self.queue_size = queue_size
+
+    async def run(self, items: list) -> list:
+        """依次将 items 交由各个阶段处理，返回值与 items 顺序一致；
+
+        阶段函数返回 str 代表处理失败，该对象不会进入后续阶段；
+        阶段函数抛出异常时，对应位置为异常信息，其余对象继续处理。
+        """
+        results = [None] * len(items)
+        queues = [Queue(self.queue_size) for _ in self.stages]
+        workers = [
+            create_task(
+                self.__worker(
+                    index,
+                    function,
+                    queues,
+                    results,
+                )
+            )
+            for index, (function, size) in enumerate(self.stages)
+            for _ in range(size)
+        ]
+        feeder = create_task(self.__feed(items, queues))
+        try:
+            # 工作协程仅在程序退出等异常情况下结束，此时不再等待队列清空
+            done, __ = await wait([feeder, *workers], return_when=FIRST_COMPLETED)
+            if feeder not in done:
+                for i in done:
+                    i.result()
+        finally:
+            for task in (feeder, *workers):
+                task.cancel()
+            await gather(feeder, *workers, return_exceptions=True)
+        return results
+
+    @staticmethod
+    async def __feed(items: list, queues: list[Queue]) -> None:
+        for item in enumerate(items):
+            await queues[0].put(item)
+        for queue in queues:
+            await queue.join()
+
+    @staticmethod
+    async def __worker(
+        index: int,
+        function: Callable[[Any], Awaitable[Any]],
+        queues: list[Queue],
+        results: list,
+    ) -> None:
+        last = index == len(queues) - 1
+        while True:
+            position, value = await queues[index].get()
+            try:
+                try:
+                    value = await function(value)
+                except BaseException as error:
+                    value = str(error) or type(error).__name__
+                    # 工作协程自身被取消或程序退出时不再处理后续对象
+                    if current_task().cancelling() or not isinstance(
+                        error, Exception | CancelledError
+                    ):
+                        results[position] = value
+                        raise
+                if last or isinstance(value, str):
+                    results[position] = value
+                else:
+                    await queues[index + 1].put((position, value))
+            finally:
+                queues[index].task_done()
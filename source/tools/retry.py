@@ -1,15 +1,136 @@
+from asyncio import sleep
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from json.decoder import JSONDecodeError
+from random import uniform
+
+from httpx import (
+    HTTPStatusError,
+    InvalidURL,
+    LocalProtocolError,
+    NetworkError,
+    ProxyError,
+    RemoteProtocolError,
+    TimeoutException,
+    UnsupportedProtocol,
+)
+
+from ..module import CacheError, CircuitOpenError
 from ..translation import _
+from ..variable import RETRY
+
+
+class Failure:
+    """Falsy result of a request that raised; carries the error to ``retry_request``."""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+    def __bool__(self) -> bool:
+        return False
+
+
+class RetryPolicy:
+    """Decides whether and when a failed request is retried.
+
+    Delays grow exponentially from ``base`` up to ``cap`` seconds with jitter,
+    and a ``Retry-After`` header takes precedence. Errors wrapped with
+    ``raise ... from`` are classified by their cause.
+
+    Args:
+        max_retry: Number of retries after the first attempt.
+        base: Delay before the first retry in seconds.
+        cap: Longest delay in seconds.
+    """
+
+    STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+    RETRY_ERRORS = (
+        TimeoutException,
+        NetworkError,
+        RemoteProtocolError,
+        ProxyError,
+        CacheError,
+        JSONDecodeError,
+    )
+    ABORT_ERRORS = (
+        InvalidURL,
+        UnsupportedProtocol,
+        LocalProtocolError,
+        PermissionError,
+        CircuitOpenError,
+    )
+
+    def __init__(
+        self,
+        max_retry: int = RETRY,
+        base: float = 1,
+        cap: float = 30,
+    ):
+        self.max_retry = max_retry
+        self.base = base
+        self.cap = cap
+
+    def retryable(self, error: BaseException | None) -> bool:
+        for i in self.__chain(error):
+            if isinstance(i, HTTPStatusError):
+                return i.response.status_code in self.STATUS
+            if isinstance(i, self.RETRY_ERRORS):
+                return True
+            if isinstance(i, self.ABORT_ERRORS):
+                return False
+        return True
+
+    def delay(self, attempt: int, error: BaseException | None = None) -> float:
+        if (after := self.__retry_after(error)) is not None:
+            return min(after, self.cap)
+        delay = min(self.cap, self.base * 2 ** (attempt - 1))
+        return delay / 2 + uniform(0, delay / 2)
+
+    def __retry_after(self, error: BaseException | None) -> float | None:
+        for i in self.__chain(error):
+            if isinstance(i, HTTPStatusError):
+                return self.__parse_retry_after(i.response.headers.get("Retry-After"))
+        return None
+
+    @staticmethod
+    def __parse_retry_after(value: str | None) -> float | None:
+        if not value:
+            return None
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            pass
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max((date - datetime.now(timezone.utc)).total_seconds(), 0)
+
+    @staticmethod
+    def __chain(error: BaseException | None):
+        seen = set()
+        while error is not None and id(error) not in seen:
+            seen.add(id(error))
+            yield error
+            error = error.__cause__
 
 
 def retry_request(function):
     async def inner(self, *args, **kwargs):
-        if r := await function(self, *args, **kwargs):
-            return r
-        for i in range(1, self.retry + 1):
-            self.console.print(_("正在进行第 {count} 次重试").format(count=i))
-            if r := await function(self, *args, **kwargs):
+        policy: RetryPolicy = self.retry_policy
+        r = await function(self, *args, **kwargs)
+        for i in range(1, policy.max_retry + 1):
+            if r:
                 return r
-        return r
+            error = r.error if isinstance(r, Failure) else None
+            if not policy.retryable(error):
+                break
+            await sleep(policy.delay(i, error))
+            self.console.print(_("正在进行第 {count} 次重试").format(count=i))
+            r = await function(self, *args, **kwargs)
+        return None if isinstance(r, Failure) else r
 
     return inner
 
@@ -1,12 +1,43 @@
 from asyncio import sleep
 from random import uniform
+from urllib.parse import urlparse
 
+from .bucket import TokenBucket
 
-async def wait(min_delay: float | int = 1, max_delay: float | int = 2) -> None:
-    """Sleep for a random amount of time between min_delay and max_delay seconds.
+
+class Pacer:
+    """Limit the request rate per host, shared by all coroutines.
+
+    Each host gets a token bucket refilled at ``rps`` requests per second that
+    holds up to ``burst`` requests; a random delay of up to ``jitter`` seconds
+    is added to every request. An ``rps`` of 0 disables pacing for the host.
 
     Args:
-        min_delay: Minimum delay in seconds. Defaults to 1.
-        max_delay: Maximum delay in seconds. Defaults to 2.5.
+        default: Settings for hosts without their own entry.
+        hosts: Per-host settings, each with ``rps``, ``burst`` and ``jitter``.
     """
-    await sleep(uniform(min_delay, max_delay))
+
+    def __init__(
+        self,
+        default: dict = None,
+        hosts: dict[str, dict] = None,
+    ):
+        self.default = default or {"rps": 1, "burst": 1, "jitter": 0}
+        self.hosts = hosts or {}
+        self.__buckets: dict[str, tuple[TokenBucket, float]] = {}
+
+    async def wait(self, url: str) -> None:
+        host = urlparse(url).hostname or ""
+        if not (item := self.__buckets.get(host)):
+            item = self.__buckets[host] = self.__create(host)
+        bucket, jitter = item
+        await bucket.consume(1)
+        if jitter:
+            await sleep(uniform(0, jitter))
+
+    def __create(self, host: str) -> tuple[TokenBucket, float]:
+        settings = self.hosts.get(host, self.default)
+        return (
+            TokenBucket(settings["rps"], settings["burst"]),
+            settings["jitter"],
+        )
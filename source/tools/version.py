@@ -20,7 +20,8 @@ class Version:
     def __init__(self, manager: "Manager"):
         self.client = manager.client
         self.console = manager.console
-        self.retry = manager.max_retry
+        self.retry_policy = manager.retry_policy
+        self.pacer = manager.pacer
 
     @staticmethod
     def compare_versions(
@@ -43,6 +44,7 @@ class Version:
     async def get_target_version(
         self,
     ):
+        await self.pacer.wait(RELEASES)
         response = await self.client.get(
             RELEASES,
             timeout=5,
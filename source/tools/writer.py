@@ -0,0 +1,108 @@
+from asyncio import Event, Task, create_task, wait_for
+from contextlib import suppress
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Hashable
+
+if TYPE_CHECKING:
+    from .console import ColorConsole
+
+__all__ = ["BufferedWriter"]
+
+
+class BufferedWriter:
+    """Write-behind buffer that hands rows to ``write`` in batches.
+
+    A batch is written once ``size`` rows are buffered or every ``interval``
+    seconds. Rows are keyed, so a later row replaces a buffered one with the
+    same key, and rows stay readable through ``get`` and ``items`` until their
+    batch is written. A batch that fails or is cancelled is put back, with
+    rows buffered in the meantime taking precedence, and is retried on the
+    next interval and again on ``close``.
+
+    Args:
+        write: Coroutine function that writes a batch of rows.
+        console: Console used to report failed batches.
+        message: Error message with an ``{error}`` placeholder.
+        size: Buffered rows that trigger a write.
+        interval: Seconds between writes.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[dict], Awaitable[None]],
+        console: "ColorConsole",
+        message: str,
+        size: int = 256,
+        interval: float = 0.5,
+    ):
+        self.__write = write
+        self.console = console
+        self.message = message
+        self.size = size
+        self.interval = interval
+        self.__pending: dict = {}
+        self.__flushing: dict = {}
+        self.__event = Event()
+        self.__closing = False
+        self.__task: Task | None = None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self.__pending[key] = value
+        if len(self.__pending) >= self.size:
+            self.__event.set()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        if key in self.__pending:
+            return self.__pending[key]
+        return self.__flushing.get(key, default)
+
+    def items(self):
+        return (self.__flushing | self.__pending).items()
+
+    def discard(self, predicate: Callable[[Hashable], bool]) -> None:
+        for buffer in (self.__pending, self.__flushing):
+            for key in [i for i in buffer if predicate(i)]:
+                del buffer[key]
+
+    async def flush(self) -> None:
+        if not self.__pending:
+            return
+        batch, self.__pending = self.__pending, {}
+        self.__flushing |= batch
+        self.__event.clear()
+        try:
+            await self.__write(batch)
+        except BaseException:
+            self.__pending = batch | self.__pending
+            raise
+        finally:
+            for key, value in batch.items():
+                if self.__flushing.get(key) is value:
+                    del self.__flushing[key]
+
+    def start(self) -> None:
+        self.__closing = False
+        self.__task = create_task(self.__run())
+
+    async def close(self) -> None:
+        error = None
+        if self.__task:
+            self.__closing = True
+            self.__event.set()
+            try:
+                await self.__task
+            except Exception as e:
+                error = e
+            self.__task = None
+        # 先写入剩余数据，再报告后台任务的异常
+        await self.flush()
+        if error:
+            raise error
+
+    async def __run(self) -> None:
+        while not self.__closing:
+            with suppress(TimeoutError):
+                await wait_for(self.__event.wait(), self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                self.console.error(self.message.format(error=repr(e)))
@@ -1 +1 @@
-from .translate import switch_language, _
+from .translate import get_language, switch_language, _
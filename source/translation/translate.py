@@ -20,8 +20,9 @@ class TranslationManager:
         if not localedir:
             localedir = ROOT.joinpath("locale")
         self.localedir = Path(localedir)
+        self.language = self.get_language_code()
         self.current_translator = self.setup_translation(
-            self.get_language_code(),
+            self.language,
         )
 
     @staticmethod
@@ -60,6 +61,7 @@ class TranslationManager:
 
     def switch_language(self, language: str = "en_US"):
         """切换当前使用的语言"""
+        self.language = language
         self.current_translator = self.setup_translation(language)
 
     def gettext(self, message):
@@ -83,5 +85,10 @@ def switch_language(language: str = "en_US"):
     _ = translation_manager.gettext
 
 
+def get_language() -> str:
+    """返回当前使用的语言"""
+    return translation_manager.language
+
+
 # 设置默认翻译函数
 _ = _translate
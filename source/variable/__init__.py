@@ -5,6 +5,16 @@ from .internal import (
     PC_DOWNLOAD_HEADERS,
     TIMEOUT,
     RETRY,
+    RETRY_BACKOFF,
+    PIPELINE,
+    CONCURRENCY,
+    BANDWIDTH,
+    CIRCUIT_BREAKER,
+    PACING,
+    DETAIL_CACHE,
+    PAGE_CLIENT,
+    MEDIA_CLIENT,
+    SQLITE_PRAGMA,
     APP_USERAGENT,
     APP_DATA_HEADERS,
     APP_HEADERS,
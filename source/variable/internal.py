@@ -46,6 +46,84 @@ TIMEOUT = 10
 
 RETRY = 5
 
+# 单位为秒，重试间隔从 base 开始逐次翻倍，最长为 cap
+RETRY_BACKOFF = {
+    "base": 1,
+    "cap": 30,
+}
+
+PIPELINE = {
+    "fetch": 4,
+    "extract": 1,
+    "download": 2,
+    "queue": 16,
+}
+
+# rps：每秒请求次数，burst：允许连续发送的请求次数，jitter：随机延迟上限（秒）
+PACING = {
+    "default": {"rps": 1, "burst": 1, "jitter": 0},
+    "hosts": {
+        "www.kuaishou.com": {"rps": 1, "burst": 2, "jitter": 0.5},
+        "live.kuaishou.com": {"rps": 1, "burst": 2, "jitter": 0.5},
+        "v.kuaishou.com": {"rps": 4, "burst": 4, "jitter": 0.1},
+    },
+}
+
+# threshold 设置为 0 时关闭熔断
+CIRCUIT_BREAKER = {
+    "threshold": 0.5,
+    "minimum": 10,
+    "window": 60,
+    "cooldown": 30,
+    "probes": 1,
+}
+
+# 单位为字节每秒，设置为 0 时不限制
+BANDWIDTH = {
+    "rate": 0,
+    "hosts": {},
+}
+
+# ceiling 设置为 None 时取 max_workers 与 8 中的较大值
+CONCURRENCY = {
+    "floor": 1,
+    "ceiling": None,
+}
+
+# 超时设置为 None 时使用 timeout 参数
+PAGE_CLIENT = {
+    "max_connections": 32,
+    "max_keepalive_connections": 16,
+    "keepalive_expiry": 15,
+    "http2": False,
+    "connect_timeout": None,
+    "read_timeout": None,
+    "pool_timeout": None,
+}
+
+MEDIA_CLIENT = {
+    "max_connections": 64,
+    "max_keepalive_connections": 32,
+    "keepalive_expiry": 30,
+    "http2": False,
+    "connect_timeout": None,
+    "read_timeout": None,
+    "pool_timeout": None,
+}
+
+DETAIL_CACHE = {
+    "size": 256,
+    "ttl": 60,
+}
+
+SQLITE_PRAGMA = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "MEMORY",
+    "cache_size": -64 * 1024,
+}
+
 FILE_SIGNATURES: tuple[
     tuple[
         int,